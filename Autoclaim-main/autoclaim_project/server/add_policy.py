@@ -6,6 +6,8 @@ import sys
 import os
 from datetime import datetime, timedelta
 
+from sqlalchemy import insert
+
 sys.path.insert(0, os.path.dirname(__file__))
 
 from app.db.database import SessionLocal
@@ -51,19 +53,21 @@ try:
         print(f"⚠️  Policy for KL-07-CU-7475 already exists (id={existing.id}). Skipping.")
     else:
         today = datetime.utcnow()
-        policy = models.Policy(
-            user_id=user_id,
-            plan_id=plan.id,
-            vehicle_make="Kia",
-            vehicle_model="Seltos",
-            vehicle_year=2020,
-            vehicle_registration="KL-07-CU-7475",
-            start_date=today,
-            end_date=today + timedelta(days=365),
-            status="active",
-        )
-        db.add(policy)
-        db.flush()
+        end_date = today + timedelta(days=365)
+        # Single INSERT ... RETURNING instead of add() + flush()
+        policy_id = db.execute(
+            insert(models.Policy).values(
+                user_id=user_id,
+                plan_id=plan.id,
+                vehicle_make="Kia",
+                vehicle_model="Seltos",
+                vehicle_year=2020,
+                vehicle_registration="KL-07-CU-7475",
+                start_date=today,
+                end_date=end_date,
+                status="active",
+            ).returning(models.Policy.id)
+        ).scalar_one()
 
         # Also update the user's policy_id string field
         user.policy_id = "POL-2024-00007"
@@ -71,15 +75,15 @@ try:
 
         db.commit()
         print(f"✅ Policy created successfully!")
-        print(f"   Policy DB id  : {policy.id}")
+        print(f"   Policy DB id  : {policy_id}")
         print(f"   Policy Number : POL-2024-00007")
         print(f"   Vehicle       : 2020 Kia Seltos")
         print(f"   Registration  : KL-07-CU-7475")
         print(f"   VIN / Chase   : WVWF14601ET093171")
         print(f"   Coverage      : ₹5,00,000")
         print(f"   Type          : Comprehensive")
-        print(f"   Start         : {today.strftime('%Y-%m-%d')}")
-        print(f"   End           : {(today + timedelta(days=365)).strftime('%Y-%m-%d')}")
+        print(f"   Start         : {today.date().isoformat()}")
+        print(f"   End           : {end_date.date().isoformat()}")
         print(f"   Status        : active")
         print(f"   Linked user   : {user.email}")
 
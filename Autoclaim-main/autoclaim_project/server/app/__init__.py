@@ -1 +1,7 @@
 # App package initialization
+
+# Configure the "app" logger once for every entry point (server, Celery worker,
+# and the maintenance/debug scripts that import app.* directly)
+from app.core.logging_config import setup_logging
+
+setup_logging()
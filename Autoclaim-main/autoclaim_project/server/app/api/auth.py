@@ -5,13 +5,15 @@ Handles user registration, login, and current user info.
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from fastapi.security import OAuth2PasswordRequestForm
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy import select, update
 from sqlalchemy.orm import Session
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional
 
-from app.db.database import get_db
+from app.db.database import get_db, dialect_insert
 from app.db import models
-from app.core.security import verify_password, get_password_hash, create_access_token
+from app.core.security import verify_password_async, get_password_hash_async, create_access_token
 from app.core.dependencies import get_current_user
 
 router = APIRouter(tags=["Authentication"])
@@ -19,16 +21,47 @@ router = APIRouter(tags=["Authentication"])
 
 class RegisterRequest(BaseModel):
     """Registration request body schema."""
-    email: str
+    # Max lengths match the User columns, so over-long input is a 422 not a DB error
+    email: str = Field(max_length=254)
     password: str
     username: Optional[str] = None  # Frontend uses 'username' for name
     name: Optional[str] = None
-    policy_number: Optional[str] = None
-    vehicle_number: Optional[str] = None
+    policy_number: Optional[str] = Field(default=None, max_length=32)
+    vehicle_number: Optional[str] = Field(default=None, max_length=20)
+
+
+def _insert_user(db: Session, returning, **values):
+    """
+    Insert a user unless the email is taken (runs in the threadpool).
+    Returns the RETURNING row, or None if the email already exists.
+    """
+    stmt = dialect_insert(models.User).values(**values).on_conflict_do_nothing(
+        index_elements=["email"]
+    ).returning(*returning)
+    row = db.execute(stmt).first()
+    if row is None:
+        db.rollback()
+        return None
+    db.commit()
+    return row
+
+
+def _get_login_user(db: Session, email: str):
+    """Columns needed to log a user in, or None (runs in the threadpool)."""
+    return db.execute(
+        select(models.User.id, models.User.email, models.User.role, models.User.hashed_password)
+        .where(models.User.email == email)
+    ).first()
+
+
+def _update_password_hash(db: Session, user_id: int, hashed_password: str) -> None:
+    """Store a rehashed password (runs in the threadpool)."""
+    db.execute(update(models.User).where(models.User.id == user_id).values(hashed_password=hashed_password))
+    db.commit()
 
 
 @router.post("/register")
-def register(
+async def register(
     request: RegisterRequest,
     db: Session = Depends(get_db)
 ):
@@ -41,17 +74,18 @@ def register(
     Args:
         request: Registration data (email, password, name, policy_number, vehicle_number)
     """
-    # Check if user already exists
-    existing = db.query(models.User).filter(models.User.email == request.email).first()
-    if existing:
-        raise HTTPException(status_code=400, detail="Email already registered")
-    
     # Use 'username' field if 'name' is not provided (frontend compatibility)
     user_name = request.name or request.username
     
-    # Hash the password
-    hashed_pw = get_password_hash(request.password)
-    new_user = models.User(
+    # Hash the password off the event loop so it keeps serving requests
+    hashed_pw = await get_password_hash_async(request.password)
+    
+    # Insert unless the email is taken; no returned row means it already exists
+    # (DB round-trips run in the threadpool, off the event loop)
+    new_user = await run_in_threadpool(
+        _insert_user,
+        db,
+        (models.User.id,),
         email=request.email, 
         hashed_password=hashed_pw, 
         role="user",  # Hardcoded: public registration only creates 'user' accounts
@@ -59,14 +93,14 @@ def register(
         policy_id=request.policy_number,
         vehicle_number=request.vehicle_number
     )
-    db.add(new_user)
-    db.commit()
+    if new_user is None:
+        raise HTTPException(status_code=400, detail="Email already registered")
     
     return {"message": "User created successfully"}
 
 
 @router.post("/login")
-def login(
+async def login(
     form_data: OAuth2PasswordRequestForm = Depends(), 
     db: Session = Depends(get_db)
 ):
@@ -75,11 +109,19 @@ def login(
     
     Uses OAuth2 password flow - username field contains email.
     """
-    user = db.query(models.User).filter(models.User.email == form_data.username).first()
+    user = await run_in_threadpool(_get_login_user, db, form_data.username)
+    
+    if not user:
+        raise HTTPException(status_code=401, detail="Invalid credentials")
     
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    ok, new_hash = await verify_password_async(form_data.password, user.hashed_password)
+    if not ok:
         raise HTTPException(status_code=401, detail="Invalid credentials")
     
+    # Migrate legacy pbkdf2 hashes to bcrypt
+    if new_hash:
+        await run_in_threadpool(_update_password_hash, db, user.id, new_hash)
+    
     token = create_access_token(data={
         "sub": user.email, 
         "role": user.role, 
@@ -100,8 +142,8 @@ def get_current_user_info(current_user: dict = Depends(get_current_user)):
 
 
 @router.post("/admin/register-agent")
-def register_agent(
-    email: str = Query(..., description="Agent email address"),
+async def register_agent(
+    email: str = Query(..., max_length=254, description="Agent email address"),
     password: str = Query(..., description="Agent password"),
     name: str = Query(..., description="Agent full name"),
     current_user: dict = Depends(get_current_user),
@@ -127,30 +169,27 @@ def register_agent(
             detail="Only administrators can register agents"
         )
     
-    # Check if email already exists
-    existing = db.query(models.User).filter(models.User.email == email).first()
-    if existing:
-        raise HTTPException(status_code=400, detail="Email already registered")
-    
-    # Create agent account
-    hashed_pw = get_password_hash(password)
-    new_agent = models.User(
+    # Create agent account unless the email is taken
+    hashed_pw = await get_password_hash_async(password)
+    new_agent = await run_in_threadpool(
+        _insert_user,
+        db,
+        (models.User.id, models.User.created_at),
         email=email,
         hashed_password=hashed_pw,
         role="agent",
         name=name
     )
-    db.add(new_agent)
-    db.commit()
-    db.refresh(new_agent)
+    if new_agent is None:
+        raise HTTPException(status_code=400, detail="Email already registered")
     
     return {
         "message": "Agent created successfully",
         "agent": {
             "id": new_agent.id,
-            "email": new_agent.email,
-            "name": new_agent.name,
-            "role": new_agent.role,
+            "email": email,
+            "name": name,
+            "role": "agent",
             "created_at": new_agent.created_at.isoformat()
         }
     }
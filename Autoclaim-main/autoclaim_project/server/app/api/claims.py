@@ -3,79 +3,190 @@ Claims API routes.
 Handles claim submission, retrieval, and management.
 """
 
+import asyncio
+import hashlib
+import logging
 import os
+import re
 import uuid
-from typing import List, Optional
+from datetime import datetime
+from typing import Any, List, Optional
 
+import aiofiles
+import msgspec
 from fastapi import APIRouter, Depends, HTTPException, File, UploadFile, Form, Query, BackgroundTasks
-from sqlalchemy.orm import Session
+from fastapi.responses import Response
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session, joinedload
 
 from app.db.database import get_db
 from app.db import models
 from app.core.config import settings
+from app.core.responses import OrjsonResponse
 from app.core.dependencies import get_current_user, require_admin
 
-# Try to import AI service
+# Try to import the AI analysis queue (pulls in the AI services)
 try:
-    from app.services import ai_orchestrator
+    from app.services.task_queue import enqueue_claim_analysis, enqueue_claim_reanalysis
     AI_AVAILABLE = True
 except ImportError:
     AI_AVAILABLE = False
     print("Warning: AI service not available")
 
-# Import forensic mapper
-from app.services.forensic_mapper import map_forensic_to_db, extract_simple_fields
 
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/claims", tags=["Claims"])
 
+
+# ==================== Response Structs ====================
+
+class ForensicData(msgspec.Struct):
+    """Forensic analysis block of the claim detail response."""
+    exif_timestamp: Optional[datetime] = None
+    exif_gps_lat: Optional[float] = None
+    exif_gps_lon: Optional[float] = None
+    exif_location_name: Optional[str] = None
+    exif_camera_make: Optional[str] = None
+    exif_camera_model: Optional[str] = None
+    ocr_plate_text: Optional[str] = None
+    ocr_plate_confidence: Optional[float] = None
+    ai_damage_type: Optional[str] = None
+    ai_severity: Optional[str] = None
+    ai_affected_parts: Any = None
+    ai_damaged_panels: Any = None
+    ai_structural_damage: Optional[bool] = None
+    ai_recommendation: Optional[str] = None
+    ai_reasoning: Optional[str] = None
+    ai_cost_min: Optional[int] = None
+    ai_cost_max: Optional[int] = None
+    ai_risk_flags: Any = None
+    risk_flags: Any = None  # Alias for frontend
+    overall_confidence_score: Optional[float] = None
+    confidence_score: Optional[float] = None  # Alias for frontend
+    authenticity_score: Optional[float] = None
+    vehicle_make: Optional[str] = None
+    vehicle_model: Optional[str] = None
+    vehicle_year: Optional[str] = None
+    vehicle_color: Optional[str] = None
+    license_plate_text: Optional[str] = None
+    license_plate_match_status: Optional[str] = None
+    yolo_damage_detected: Optional[bool] = None
+    yolo_severity: Optional[str] = None
+    yolo_summary: Optional[str] = None
+    forgery_detected: Optional[bool] = None
+    pre_existing_damage_detected: Optional[bool] = None
+    pre_existing_indicators: Any = None
+    pre_existing_description: Optional[str] = None
+    pre_existing_confidence: Optional[float] = None
+    fraud_probability: Optional[str] = None
+    repair_cost_breakdown: Any = None
+    analyzed_at: Optional[datetime] = None
+
+
+class ClaimDetail(msgspec.Struct):
+    """Claim detail response, encoded straight to JSON bytes."""
+    id: int
+    user_email: Optional[str]
+    description: Optional[str]
+    image_paths: Any
+    front_image_path: Optional[str]
+    estimate_bill_path: Optional[str]
+    status: Optional[str]
+    created_at: Optional[datetime]
+    vehicle_number_plate: Optional[str]
+    ai_recommendation: Optional[str]
+    estimated_cost_min: Optional[int]
+    estimated_cost_max: Optional[int]
+    forensic_analysis: Optional[ForensicData] = None
+
 # Ensure uploads directory exists
 os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
 
+# Read uploads 1 MB at a time while saving
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Filename date patterns (for metadata extraction), combined into one regex
+DATE_PATTERNS = [
+    r'PXL_\d{8}_\d{9}',  # Google Pixel
+    r'(?:IMG_)?\d{8}_\d{6}',  # Samsung/Android
+    r'IMG-\d{8}-WA',  # WhatsApp
+    r'Screenshot_\d{8}-\d{6}',  # Screenshot
+    r'Photo_\d{4}-\d{2}-\d{2}',  # iPhone
+    r'VID_\d{8}_\d{6}',  # Video
+    r'\d{8}',  # Generic date
+]
+_DATE_RE = re.compile("|".join(f"(?:{pattern})" for pattern in DATE_PATTERNS))
+
 
 async def save_upload_file(upload_file: UploadFile, prefix: str = "") -> Optional[str]:
     """
     Save an uploaded file and return the path.
     Preserves original filename if it contains a date pattern (for metadata extraction),
-    otherwise uses UUID for anonymity.
+    otherwise names the file by its SHA-256 so it stays anonymous. Either way the
+    name includes the content hash, so a stored file is never overwritten with
+    different bytes and identical re-uploads are stored only once.
     """
     if not upload_file or not upload_file.filename:
         return None
     
-    import re
-    
     file_extension = os.path.splitext(upload_file.filename)[1]
     original_name = os.path.splitext(upload_file.filename)[0]
     
     # Check if filename contains a date pattern (for metadata extraction)
-    date_patterns = [
-        r'PXL_\d{8}_\d{9}',  # Google Pixel
-        r'(?:IMG_)?\d{8}_\d{6}',  # Samsung/Android
-        r'IMG-\d{8}-WA',  # WhatsApp
-        r'Screenshot_\d{8}-\d{6}',  # Screenshot
-        r'Photo_\d{4}-\d{2}-\d{2}',  # iPhone
-        r'VID_\d{8}_\d{6}',  # Video
-        r'\d{8}',  # Generic date
-    ]
+    has_date_pattern = _DATE_RE.search(original_name) is not None
     
-    has_date_pattern = any(re.search(pattern, original_name) for pattern in date_patterns)
+    # Stream to a temp file in chunks so large uploads don't block the event loop
+    # or sit fully in memory, hashing the bytes as they arrive
+    digest = hashlib.sha256()
+    temp_path = os.path.join(settings.UPLOAD_DIR, f".upload-{uuid.uuid4()}{file_extension}")
+    try:
+        async with aiofiles.open(temp_path, "wb") as f:
+            while chunk := await upload_file.read(UPLOAD_CHUNK_SIZE):
+                digest.update(chunk)
+                await f.write(chunk)
+    except BaseException:
+        # Client disconnect (cancellation) or write error: don't leave the partial file behind
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
     
     if has_date_pattern:
-        # Preserve original filename for metadata extraction
-        unique_filename = f"{prefix}{original_name}{file_extension}"
+        # Preserve original filename for metadata extraction; the hash suffix
+        # follows a "." so it can't form part of a filename date pattern
+        unique_filename = f"{prefix}{original_name}.{digest.hexdigest()[:16]}{file_extension}"
     else:
-        # Use UUID for files without date patterns
-        unique_filename = f"{prefix}{uuid.uuid4()}{file_extension}"
+        # Content-addressed name for files without date patterns
+        unique_filename = f"{prefix}{digest.hexdigest()}{file_extension}"
     
     file_path = os.path.join(settings.UPLOAD_DIR, unique_filename)
     
-    content = await upload_file.read()
-    with open(file_path, "wb") as f:
-        f.write(content)
+    if os.path.exists(file_path):
+        # Same bytes already stored - skip re-saving
+        os.remove(temp_path)
+    else:
+        os.replace(temp_path, file_path)
     
     return file_path
 
 
+def _truncate(text: Optional[str], limit: int = 100) -> Optional[str]:
+    """Shorten long descriptions for list views."""
+    if text and len(text) > limit:
+        return text[:limit] + "..."
+    return text
+
+
+def _create_claim(db: Session, **fields) -> models.Claim:
+    """Insert a claim row and return it refreshed (runs in the threadpool)."""
+    new_claim = models.Claim(**fields)
+    db.add(new_claim)
+    db.commit()
+    db.refresh(new_claim)
+    return new_claim
+
+
 @router.post("")
 async def upload_claim(
     description: str = Form(""),
@@ -96,52 +207,45 @@ async def upload_claim(
         estimate_bill: Repair estimate document
         background_tasks: FastAPI background tasks for async processing
     """
-    # Get user from database
-    user = db.query(models.User).filter(models.User.email == current_user["email"]).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
+    # User id comes straight from the token - no lookup needed
+    user_id = current_user["user_id"]
     
-    # Save damage images
-    saved_image_paths = []
-    for image in images:
-        path = await save_upload_file(image, "damage_")
-        if path:
-            saved_image_paths.append(path)
+    # Save damage images, front image and estimate bill concurrently
+    *damage_paths, front_image_path, estimate_bill_path = await asyncio.gather(
+        *[save_upload_file(image, "damage_") for image in images],
+        save_upload_file(front_image, "front_"),
+        save_upload_file(estimate_bill, "bill_")
+    )
+    # Identical images share one content-addressed path, so keep each path once
+    saved_image_paths = list(dict.fromkeys(path for path in damage_paths if path))
     
-    # Save front image and estimate bill
-    front_image_path = await save_upload_file(front_image, "front_") if front_image else None
-    estimate_bill_path = await save_upload_file(estimate_bill, "bill_") if estimate_bill else None
+    # Claims wait in 'processing' for the background task, or 'pending' without AI
+    schedule_ai = AI_AVAILABLE and background_tasks is not None
     
-    # Create claim with 'processing' status
-    new_claim = models.Claim(
-        user_id=user.id,
+    # Insert the claim on a worker thread so the blocking commit doesn't stall the event loop
+    new_claim = await run_in_threadpool(
+        _create_claim,
+        db,
+        user_id=user_id,
         description=description,
         image_paths=saved_image_paths,
         front_image_path=front_image_path,
         estimate_bill_path=estimate_bill_path,
-        status="processing"  # Will be updated by background task
+        status="processing" if schedule_ai else "pending"
     )
-    db.add(new_claim)
-    db.commit()
-    db.refresh(new_claim)
     
     # Schedule AI analysis as background task
-    if AI_AVAILABLE and background_tasks:
-        from app.services.background_tasks import process_claim_ai_analysis
-        
-        background_tasks.add_task(
-            process_claim_ai_analysis,
+    if schedule_ai:
+        enqueue_claim_analysis(
+            background_tasks,
             claim_id=new_claim.id,
             damage_image_paths=saved_image_paths,
             front_image_path=front_image_path,
             description=description
         )
-        print(f"[API] Claim {new_claim.id} submitted. AI analysis scheduled in background.")
+        logger.info("[API] Claim %s submitted. AI analysis scheduled in background.", new_claim.id)
     else:
-        # No AI available, set status to pending
-        new_claim.status = "pending"
-        db.commit()
-        print(f"[API] Claim {new_claim.id} submitted. AI service not available.")
+        logger.info("[API] Claim %s submitted. AI service not available.", new_claim.id)
     
     # Return immediate response
     return {
@@ -166,21 +270,17 @@ def get_my_claims(
     db: Session = Depends(get_db)
 ):
     """Get all claims for the current logged-in user."""
-    user = db.query(models.User).filter(models.User.email == current_user["email"]).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    
     claims = db.query(models.Claim).filter(
-        models.Claim.user_id == user.id
+        models.Claim.user_id == current_user["user_id"]
     ).order_by(models.Claim.created_at.desc()).all()
     
-    return {
-        "user_email": user.email,
+    return OrjsonResponse({
+        "user_email": current_user["email"],
         "total_claims": len(claims),
         "claims": [
             {
                 "id": claim.id,
-                "description": claim.description[:100] + "..." if claim.description and len(claim.description) > 100 else claim.description,
+                "description": _truncate(claim.description),
                 "images_count": len(claim.image_paths) if claim.image_paths else 0,
                 "status": claim.status,
                 "created_at": claim.created_at.isoformat(),
@@ -191,7 +291,7 @@ def get_my_claims(
             }
             for claim in claims
         ]
-    }
+    })
 
 
 @router.get("/all")
@@ -200,32 +300,56 @@ def get_all_claims(
     db: Session = Depends(get_db)
 ):
     """Get all claims from all users (Admin only)."""
-    claims = db.query(models.Claim).order_by(models.Claim.created_at.desc()).all()
+    # Read-only listing: select just the columns the dashboard needs
+    # instead of hydrating Claim/User/ForensicAnalysis instances.
+    fa = models.ForensicAnalysis
+    rows = db.execute(
+        select(
+            models.Claim.id,
+            models.Claim.description,
+            models.Claim.image_paths,
+            models.Claim.status,
+            models.Claim.created_at,
+            models.Claim.vehicle_number_plate,
+            models.Claim.ai_recommendation,
+            models.Claim.estimated_cost_min,
+            models.Claim.estimated_cost_max,
+            models.User.email.label("user_email"),
+            fa.id.label("forensic_id"),
+            fa.exif_timestamp,
+            fa.exif_location_name,
+            fa.ai_damage_type,
+            fa.ai_severity
+        )
+        .join(models.User, models.Claim.user_id == models.User.id)
+        .outerjoin(fa, fa.claim_id == models.Claim.id)
+        .order_by(models.Claim.created_at.desc())
+    ).all()
     
-    return {
-        "total_claims": len(claims),
+    return OrjsonResponse({
+        "total_claims": len(rows),
         "claims": [
             {
-                "id": claim.id,
-                "user_email": claim.user.email,
-                "description": claim.description[:100] + "..." if claim.description and len(claim.description) > 100 else claim.description,
-                "images_count": len(claim.image_paths) if claim.image_paths else 0,
-                "status": claim.status,
-                "created_at": claim.created_at.isoformat(),
-                "vehicle_number_plate": claim.vehicle_number_plate,
-                "ai_recommendation": claim.ai_recommendation,
-                "estimated_cost_min": claim.estimated_cost_min,
-                "estimated_cost_max": claim.estimated_cost_max,
+                "id": row.id,
+                "user_email": row.user_email,
+                "description": _truncate(row.description),
+                "images_count": len(row.image_paths) if row.image_paths else 0,
+                "status": row.status,
+                "created_at": row.created_at.isoformat(),
+                "vehicle_number_plate": row.vehicle_number_plate,
+                "ai_recommendation": row.ai_recommendation,
+                "estimated_cost_min": row.estimated_cost_min,
+                "estimated_cost_max": row.estimated_cost_max,
                 "forensic": {
-                    "exif_timestamp": claim.forensic_analysis.exif_timestamp.isoformat() if claim.forensic_analysis and claim.forensic_analysis.exif_timestamp else None,
-                    "exif_location_name": claim.forensic_analysis.exif_location_name if claim.forensic_analysis else None,
-                    "ai_damage_type": claim.forensic_analysis.ai_damage_type if claim.forensic_analysis else None,
-                    "ai_severity": claim.forensic_analysis.ai_severity if claim.forensic_analysis else None
-                } if claim.forensic_analysis else None
+                    "exif_timestamp": row.exif_timestamp.isoformat() if row.exif_timestamp else None,
+                    "exif_location_name": row.exif_location_name,
+                    "ai_damage_type": row.ai_damage_type,
+                    "ai_severity": row.ai_severity
+                } if row.forensic_id is not None else None
             }
-            for claim in claims
+            for row in rows
         ]
-    }
+    })
 
 
 @router.get("/{claim_id}")
@@ -235,76 +359,82 @@ def get_claim_details(
     db: Session = Depends(get_db)
 ):
     """Get detailed claim information."""
-    claim = db.query(models.Claim).filter(models.Claim.id == claim_id).first()
+    # The detail view shows the damage/forensics JSON groups but not the raw blobs
+    claim = db.query(models.Claim).options(
+        joinedload(models.Claim.user),
+        joinedload(models.Claim.forensic_analysis)
+        .undefer_group("damage")
+        .undefer_group("forensics")
+    ).filter(models.Claim.id == claim_id).first()
     if not claim:
         raise HTTPException(status_code=404, detail="Claim not found")
     
     # Check access
-    user = db.query(models.User).filter(models.User.email == current_user["email"]).first()
-    if current_user["role"] != "admin" and claim.user_id != user.id:
+    if current_user["role"] != "admin" and claim.user_id != current_user["user_id"]:
         raise HTTPException(status_code=403, detail="Access denied")
     
     # Build forensic data if available
     forensic_data = None
     if claim.forensic_analysis:
         fa = claim.forensic_analysis
-        forensic_data = {
-            "exif_timestamp": fa.exif_timestamp.isoformat() if fa.exif_timestamp else None,
-            "exif_gps_lat": fa.exif_gps_lat,
-            "exif_gps_lon": fa.exif_gps_lon,
-            "exif_location_name": fa.exif_location_name,
-            "exif_camera_make": fa.exif_camera_make,
-            "exif_camera_model": fa.exif_camera_model,
-            "ocr_plate_text": fa.ocr_plate_text,
-            "ocr_plate_confidence": fa.ocr_plate_confidence,
-            "ai_damage_type": fa.ai_damage_type,
-            "ai_severity": fa.ai_severity,
-            "ai_affected_parts": fa.ai_affected_parts,
-            "ai_damaged_panels": fa.ai_damaged_panels,
-            "ai_structural_damage": fa.ai_structural_damage,
-            "ai_recommendation": fa.ai_recommendation,
-            "ai_reasoning": fa.ai_reasoning,
-            "ai_cost_min": fa.ai_cost_min,
-            "ai_cost_max": fa.ai_cost_max,
-            "ai_risk_flags": fa.ai_risk_flags,
-            "risk_flags": fa.ai_risk_flags,  # Alias for frontend
-            "overall_confidence_score": fa.overall_confidence_score,
-            "confidence_score": fa.overall_confidence_score,  # Alias for frontend
-            "authenticity_score": fa.authenticity_score,
-            "vehicle_make": fa.vehicle_make,
-            "vehicle_model": fa.vehicle_model,
-            "vehicle_year": fa.vehicle_year,
-            "vehicle_color": fa.vehicle_color,
-            "license_plate_text": fa.license_plate_text,
-            "license_plate_match_status": fa.license_plate_match_status,
-            "yolo_damage_detected": fa.yolo_damage_detected,
-            "yolo_severity": fa.yolo_severity,
-            "yolo_summary": fa.yolo_summary,
-            "forgery_detected": fa.forgery_detected,
-            "pre_existing_damage_detected": fa.pre_existing_damage_detected,
-            "pre_existing_indicators": fa.pre_existing_indicators,
-            "pre_existing_description": fa.pre_existing_description,
-            "pre_existing_confidence": fa.pre_existing_confidence,
-            "fraud_probability": fa.fraud_probability,
-            "repair_cost_breakdown": fa.repair_cost_breakdown,
-            "analyzed_at": fa.analyzed_at.isoformat() if fa.analyzed_at else None
-        }
+        forensic_data = ForensicData(
+            exif_timestamp=fa.exif_timestamp,
+            exif_gps_lat=fa.exif_gps_lat,
+            exif_gps_lon=fa.exif_gps_lon,
+            exif_location_name=fa.exif_location_name,
+            exif_camera_make=fa.exif_camera_make,
+            exif_camera_model=fa.exif_camera_model,
+            ocr_plate_text=fa.ocr_plate_text,
+            ocr_plate_confidence=fa.ocr_plate_confidence,
+            ai_damage_type=fa.ai_damage_type,
+            ai_severity=fa.ai_severity,
+            ai_affected_parts=fa.ai_affected_parts,
+            ai_damaged_panels=fa.ai_damaged_panels,
+            ai_structural_damage=fa.ai_structural_damage,
+            ai_recommendation=fa.ai_recommendation,
+            ai_reasoning=fa.ai_reasoning,
+            ai_cost_min=fa.ai_cost_min,
+            ai_cost_max=fa.ai_cost_max,
+            ai_risk_flags=fa.ai_risk_flags,
+            risk_flags=fa.ai_risk_flags,
+            overall_confidence_score=fa.overall_confidence_score,
+            confidence_score=fa.overall_confidence_score,
+            authenticity_score=fa.authenticity_score,
+            vehicle_make=fa.vehicle_make,
+            vehicle_model=fa.vehicle_model,
+            vehicle_year=fa.vehicle_year,
+            vehicle_color=fa.vehicle_color,
+            license_plate_text=fa.license_plate_text,
+            license_plate_match_status=fa.license_plate_match_status,
+            yolo_damage_detected=fa.yolo_damage_detected,
+            yolo_severity=fa.yolo_severity,
+            yolo_summary=fa.yolo_summary,
+            forgery_detected=fa.forgery_detected,
+            pre_existing_damage_detected=fa.pre_existing_damage_detected,
+            pre_existing_indicators=fa.pre_existing_indicators,
+            pre_existing_description=fa.pre_existing_description,
+            pre_existing_confidence=fa.pre_existing_confidence,
+            fraud_probability=fa.fraud_probability,
+            repair_cost_breakdown=fa.repair_cost_breakdown,
+            analyzed_at=fa.analyzed_at
+        )
     
-    return {
-        "id": claim.id,
-        "user_email": claim.user.email,
-        "description": claim.description,
-        "image_paths": claim.image_paths,
-        "front_image_path": claim.front_image_path,
-        "estimate_bill_path": claim.estimate_bill_path,
-        "status": claim.status,
-        "created_at": claim.created_at.isoformat(),
-        "vehicle_number_plate": claim.vehicle_number_plate,
-        "ai_recommendation": claim.ai_recommendation,
-        "estimated_cost_min": claim.estimated_cost_min,
-        "estimated_cost_max": claim.estimated_cost_max,
-        "forensic_analysis": forensic_data
-    }
+    detail = ClaimDetail(
+        id=claim.id,
+        user_email=claim.user.email,
+        description=claim.description,
+        image_paths=claim.image_paths,
+        front_image_path=claim.front_image_path,
+        estimate_bill_path=claim.estimate_bill_path,
+        status=claim.status,
+        created_at=claim.created_at,
+        vehicle_number_plate=claim.vehicle_number_plate,
+        ai_recommendation=claim.ai_recommendation,
+        estimated_cost_min=claim.estimated_cost_min,
+        estimated_cost_max=claim.estimated_cost_max,
+        forensic_analysis=forensic_data
+    )
+    return Response(msgspec.json.encode(detail), media_type="application/json")
 
 
 @router.put("/{claim_id}/status")
@@ -318,11 +448,14 @@ def update_claim_status(
     if new_status not in ["pending", "approved", "rejected"]:
         raise HTTPException(status_code=400, detail="Invalid status. Use: pending, approved, rejected")
     
-    claim = db.query(models.Claim).filter(models.Claim.id == claim_id).first()
-    if not claim:
+    # Single UPDATE; no need to load the claim just to set one column
+    updated = db.execute(
+        update(models.Claim)
+        .where(models.Claim.id == claim_id)
+        .values(status=new_status)
+    ).rowcount
+    if not updated:
         raise HTTPException(status_code=404, detail="Claim not found")
-    
-    claim.status = new_status
     db.commit()
     
     return {"message": f"Claim {claim_id} status updated to {new_status}"}
@@ -331,65 +464,27 @@ def update_claim_status(
 @router.post("/{claim_id}/analyze")
 def reanalyze_claim(
     claim_id: int,
+    background_tasks: BackgroundTasks,
     current_user: dict = Depends(require_admin),
     db: Session = Depends(get_db)
 ):
-    """Re-run AI analysis on a claim (Admin only)."""
-    claim = db.query(models.Claim).filter(models.Claim.id == claim_id).first()
-    if not claim:
+    """
+    Queue a re-run of AI analysis on a claim (Admin only).
+    
+    The analysis runs after the response is sent; poll GET /claims/{claim_id}
+    for the refreshed forensic data.
+    """
+    claim_exists = db.query(models.Claim.id).filter(models.Claim.id == claim_id).first()
+    if not claim_exists:
         raise HTTPException(status_code=404, detail="Claim not found")
     
     if not AI_AVAILABLE:
         raise HTTPException(status_code=503, detail="AI service not available")
     
-    try:
-        ai_result = ai_orchestrator.analyze_claim(
-            damage_image_paths=claim.image_paths or [],
-            front_image_path=claim.front_image_path,
-            description=claim.description or ""
-        )
-        
-        if ai_result:
-            # Update claim quick-access fields
-            if ai_result.get("ocr"):
-                claim.vehicle_number_plate = ai_result["ocr"].get("plate_text")
-            
-            if ai_result.get("ai_analysis"):
-                analysis = ai_result["ai_analysis"]
-                claim.ai_recommendation = analysis.get("recommendation")
-                claim.estimated_cost_min = analysis.get("cost_min")
-                claim.estimated_cost_max = analysis.get("cost_max")
-            
-            # Update or create forensic analysis
-            if claim.forensic_analysis:
-                fa = claim.forensic_analysis
-            else:
-                fa = models.ForensicAnalysis(claim_id=claim.id)
-                db.add(fa)
-            
-            # Update forensic fields
-            fa.exif_timestamp = ai_result.get("metadata", {}).get("timestamp")
-            fa.exif_gps_lat = ai_result.get("metadata", {}).get("gps_lat")
-            fa.exif_gps_lon = ai_result.get("metadata", {}).get("gps_lon")
-            fa.exif_location_name = ai_result.get("metadata", {}).get("location_name")
-            fa.ocr_plate_text = ai_result.get("ocr", {}).get("plate_text")
-            fa.ocr_plate_confidence = ai_result.get("ocr", {}).get("confidence")
-            fa.ai_damage_type = ai_result.get("ai_analysis", {}).get("damage_type")
-            fa.ai_severity = ai_result.get("ai_analysis", {}).get("severity")
-            fa.ai_affected_parts = ai_result.get("ai_analysis", {}).get("affected_parts", [])
-            fa.ai_recommendation = ai_result.get("ai_analysis", {}).get("recommendation")
-            fa.ai_reasoning = ai_result.get("ai_analysis", {}).get("analysis_text")
-            fa.ai_cost_min = ai_result.get("ai_analysis", {}).get("cost_min")
-            fa.ai_cost_max = ai_result.get("ai_analysis", {}).get("cost_max")
-            fa.ai_risk_flags = ai_result.get("ai_analysis", {}).get("risk_flags", [])
-            fa.ai_raw_response = ai_result
-            
-            db.commit()
-        
-        return {
-            "message": "Analysis complete",
-            "claim_id": claim_id,
-            "ai_result": ai_result
-        }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
+    enqueue_claim_reanalysis(background_tasks, claim_id)
+    
+    return {
+        "message": "Re-analysis queued",
+        "claim_id": claim_id,
+        "status_url": f"/claims/{claim_id}"
+    }
@@ -0,0 +1,73 @@
+"""
+One-shot database bootstrap.
+Creates the tables and the default admin user.
+
+Run once per deployment with `python -m app.bootstrap`, or let the
+server do it on startup when RUN_MIGRATIONS is enabled (the default).
+"""
+
+from app.core.security import get_password_hash, get_password_hash_async
+from app.db.database import engine, SessionLocal
+from app.db import models
+
+# Hardcoded admin credentials
+ADMIN_EMAIL = "admin@autoclaim.com"
+ADMIN_PASSWORD = "admin123"
+
+
+def create_tables():
+    """Create any missing tables."""
+    models.Base.metadata.create_all(bind=engine)
+
+
+def _admin_exists(db) -> bool:
+    # id-only probe on the email index; no_autoflush keeps it a pure read
+    with db.no_autoflush:
+        return db.query(models.User.id).filter(models.User.email == ADMIN_EMAIL).first() is not None
+
+
+def _add_admin(db, hashed_password: str):
+    admin = models.User(
+        email=ADMIN_EMAIL,
+        hashed_password=hashed_password,
+        role="admin",
+        name="System Administrator"
+    )
+    db.add(admin)
+    db.commit()
+    print(f"✅ Admin user created: {ADMIN_EMAIL} / {ADMIN_PASSWORD}")
+
+
+def ensure_admin_user():
+    """Create the default admin user if it doesn't exist."""
+    db = SessionLocal()
+    try:
+        if _admin_exists(db):
+            print(f"✅ Admin user exists: {ADMIN_EMAIL}")
+            return
+        _add_admin(db, get_password_hash(ADMIN_PASSWORD))
+    finally:
+        db.close()
+
+
+async def ensure_admin_user_async():
+    """ensure_admin_user for the startup hook; hashes on the password executor."""
+    db = SessionLocal()
+    try:
+        if _admin_exists(db):
+            print(f"✅ Admin user exists: {ADMIN_EMAIL}")
+            return
+        _add_admin(db, await get_password_hash_async(ADMIN_PASSWORD))
+    finally:
+        db.close()
+
+
+def main():
+    """Create tables and the admin user."""
+    create_tables()
+    print("✅ Database tables ready")
+    ensure_admin_user()
+
+
+if __name__ == "__main__":
+    main()
@@ -19,19 +19,51 @@ class Settings:
     
     # Security
     SECRET_KEY: str = os.getenv("SECRET_KEY", "basil")  # Change in production!
-    ALGORITHM: str = "HS256"
+    # HS256 is the cheapest to sign/verify and is enough for a single service;
+    # for RS*/ES* set SECRET_KEY to the PEM private key and JWT_PUBLIC_KEY to its public key
+    ALGORITHM: str = os.getenv("JWT_ALGORITHM", "HS256")
+    JWT_PUBLIC_KEY: str = os.getenv("JWT_PUBLIC_KEY", "")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
     
+    # bcrypt cost factor (log2 rounds; raise as hardware improves, startup logs the hash time)
+    BCRYPT_ROUNDS: int = int(os.getenv("BCRYPT_ROUNDS", "12"))
+    
     # Database
     DATABASE_URL: str = os.getenv("DATABASE_URL", f"sqlite:///{BASE_DIR}/autoclaim.db")
     
+    # Create tables and the admin user on startup. Set to false when running
+    # several workers and run `python -m app.bootstrap` once per deploy instead.
+    RUN_MIGRATIONS: bool = os.getenv("RUN_MIGRATIONS", "true").lower() in ("1", "true", "yes")
+    
     # AI Services
     GROQ_API_KEY: str = os.getenv("GROQ_API_KEY", "")
     
+    # Prebuilt TensorRT engine for the damage model (see export_yolo_engine.py);
+    # used instead of the PyTorch weights when the file exists
+    YOLO_ENGINE_PATH: str = os.getenv("YOLO_ENGINE_PATH", str(BASE_DIR / "models" / "car_damage_int8.engine"))
+    # ONNX export of the same model, run through ONNX Runtime on CPU-only hosts
+    YOLO_ONNX_PATH: str = os.getenv("YOLO_ONNX_PATH", str(BASE_DIR / "models" / "car_damage.onnx"))
+    # Most damage images sent through one YOLO forward pass (also the max batch
+    # of the exported engine/ONNX models)
+    YOLO_MAX_BATCH: int = int(os.getenv("YOLO_MAX_BATCH", "8"))
+    
+    # Cache for per-image AI results and Groq extractions (in-process when REDIS_URL is unset)
+    REDIS_URL: str = os.getenv("REDIS_URL", "")
+    AI_CACHE_TTL: int = int(os.getenv("AI_CACHE_TTL", "86400"))
+    # Encoded Groq image payloads are large; keep them only long enough for retries
+    B64_CACHE_TTL: int = int(os.getenv("B64_CACHE_TTL", "600"))
+    
+    # Celery broker for claim analysis (see app/services/task_queue.py);
+    # when unset, analysis runs in-process via FastAPI BackgroundTasks
+    CELERY_BROKER_URL: str = os.getenv("CELERY_BROKER_URL", "")
+    
     # Groq model (LLaMA 4 Scout Vision)
     GROQ_MODEL: str = "meta-llama/llama-4-scout-17b-16e-instruct"
 
     
+    # Log level for the app.* loggers
+    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO").upper()
+    
     # Upload directory
     UPLOAD_DIR: str = str(BASE_DIR / "uploads")
     
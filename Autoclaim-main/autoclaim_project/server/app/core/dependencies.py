@@ -22,7 +22,7 @@ def get_current_user(token: str = Depends(oauth2_scheme)) -> dict:
         token: JWT token extracted from Authorization header
         
     Returns:
-        Dict with user email and role
+        Dict with user email, role and user_id
         
     Raises:
         HTTPException: If token is invalid or missing
@@ -39,11 +39,12 @@ def get_current_user(token: str = Depends(oauth2_scheme)) -> dict:
     
     email: str = payload.get("sub")
     role: str = payload.get("role")
+    user_id: int = payload.get("user_id")
     
     if email is None:
         raise credentials_exception
     
-    return {"email": email, "role": role}
+    return {"email": email, "role": role, "user_id": user_id}
 
 
 def require_admin(current_user: dict = Depends(get_current_user)) -> dict:
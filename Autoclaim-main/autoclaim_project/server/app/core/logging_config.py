@@ -0,0 +1,56 @@
+"""
+Logging setup for the AutoClaim server.
+Application loggers ("app.*") hand records to a queue; a background listener
+thread does the formatting and stdout writes, so request and analysis threads
+never block on console I/O.
+
+Called from app/__init__.py, so every entry point that imports the app package
+(server, Celery worker, scripts) is configured.
+"""
+
+import atexit
+import logging
+import os
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+from app.core.config import settings
+
+_listener = None
+
+
+def _restart_after_fork() -> None:
+    """The listener thread doesn't survive fork(); give the child its own (e.g. Celery prefork)."""
+    global _listener
+    if _listener is None:
+        return
+    _listener = None
+    app_logger = logging.getLogger("app")
+    for handler in [h for h in app_logger.handlers if isinstance(h, QueueHandler)]:
+        app_logger.removeHandler(handler)
+    setup_logging()
+
+
+def setup_logging() -> None:
+    """Attach the queue handler to the "app" logger (safe to call more than once)."""
+    global _listener
+    if _listener is not None:
+        return
+
+    log_queue = queue.SimpleQueue()
+    console = logging.StreamHandler()
+    console.setFormatter(logging.Formatter("%(message)s"))
+
+    app_logger = logging.getLogger("app")
+    app_logger.setLevel(settings.LOG_LEVEL)
+    app_logger.addHandler(QueueHandler(log_queue))
+    app_logger.propagate = False
+
+    _listener = QueueListener(log_queue, console, respect_handler_level=True)
+    _listener.start()
+    # Flush whatever is still queued on shutdown
+    atexit.register(_listener.stop)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_restart_after_fork)
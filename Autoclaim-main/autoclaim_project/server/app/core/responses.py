@@ -0,0 +1,17 @@
+"""
+JSON response class serialized with orjson.
+Same output as FastAPI's ORJSONResponse, which is deprecated in current
+FastAPI and warns on every response.
+"""
+
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+class OrjsonResponse(JSONResponse):
+    """JSONResponse rendered with orjson (datetimes, numpy values, non-str keys)."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
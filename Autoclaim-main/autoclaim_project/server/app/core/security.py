@@ -3,24 +3,102 @@ Security utilities for authentication and authorization.
 Handles password hashing and JWT token operations.
 """
 
-from datetime import datetime, timedelta
+import asyncio
+import hashlib
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from cachetools import TLRUCache
 from passlib.context import CryptContext
-from jose import jwt, JWTError
+import jwt
 
 from app.core.config import settings
 
-# Password hashing context
-pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
+# Password hashing context. bcrypt is the default; pbkdf2_sha256 hashes from
+# older accounts still verify and are re-hashed to bcrypt on the next login.
+pwd_context = CryptContext(
+    schemes=["bcrypt", "pbkdf2_sha256"],
+    default="bcrypt",
+    deprecated=["pbkdf2_sha256"],
+    bcrypt__rounds=settings.BCRYPT_ROUNDS
+)
+
+# Bound once so the login/register paths skip the attribute lookups
+_verify_and_update = pwd_context.verify_and_update
+_hash = pwd_context.hash
+
+# bcrypt releases the GIL, so one worker per core hashes in parallel
+# without starving the event loop or the default request threadpool
+_pw_executor = ThreadPoolExecutor(max_workers=os.cpu_count() or 1, thread_name_prefix="pwhash")
+
+# JWT keys parsed once (PEM decoding for RSA/EC keys would otherwise run per call)
+_jwt_algorithm = jwt.get_algorithm_by_name(settings.ALGORITHM)
+_JWT_KEY = _jwt_algorithm.prepare_key(settings.SECRET_KEY)
+_JWT_VERIFY_KEY = (
+    _jwt_algorithm.prepare_key(settings.JWT_PUBLIC_KEY)
+    if settings.JWT_PUBLIC_KEY else _JWT_KEY
+)
+_JWT_ALGORITHMS = [settings.ALGORITHM]
+_DECODE_OPTIONS = {"verify_aud": False}
+
+# Default token lifetime in seconds (JWT exp is an integer epoch)
+_DEFAULT_EXPIRE_SECONDS = settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+
+# Verified token payloads keyed by SHA-256 of the token. Entries live for at
+# most 60s and never past the token's own exp (wall-clock timer for that reason).
+TOKEN_CACHE_TTL = 60
+
 
+def _token_ttu(_key, payload, now):
+    return min(now + TOKEN_CACHE_TTL, payload.get("exp", now))
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a plain password against a hashed password."""
-    return pwd_context.verify(plain_password, hashed_password)
+
+_token_cache = TLRUCache(maxsize=10_000, ttu=_token_ttu, timer=time.time)
+_token_cache_lock = threading.Lock()
+
+
+def verify_password(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    """
+    Verify a plain password against a hashed password.
+    
+    Returns:
+        (ok, new_hash) - new_hash is set when the stored hash uses a
+        deprecated scheme or cost and should be replaced
+    """
+    return _verify_and_update(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
     """Hash a password for storing."""
-    return pwd_context.hash(password)
+    return _hash(password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    """Async verify_password, run on the password executor."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_pw_executor, _verify_and_update, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Async get_password_hash, run on the password executor."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_pw_executor, _hash, password)
+
+
+def benchmark_password_hash() -> float:
+    """Time a single password hash at the current cost, in milliseconds."""
+    start = time.perf_counter()
+    _hash("benchmark-password")
+    return (time.perf_counter() - start) * 1000
+
+
+async def benchmark_password_hash_async() -> float:
+    """Async benchmark_password_hash, run on the password executor."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_pw_executor, benchmark_password_hash)
 
 
 def create_access_token(data: dict, expires_delta: timedelta = None) -> str:
@@ -36,16 +114,12 @@ def create_access_token(data: dict, expires_delta: timedelta = None) -> str:
     """
     to_encode = data.copy()
     
-    if expires_delta:
-        expire = datetime.utcnow() + expires_delta
-    else:
-        expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    
-    to_encode.update({"exp": expire})
+    lifetime = int(expires_delta.total_seconds()) if expires_delta else _DEFAULT_EXPIRE_SECONDS
+    to_encode["exp"] = int(time.time()) + lifetime
     
     return jwt.encode(
         to_encode, 
-        settings.SECRET_KEY, 
+        _JWT_KEY, 
         algorithm=settings.ALGORITHM
     )
 
@@ -60,12 +134,23 @@ def verify_token(token: str) -> dict | None:
     Returns:
         Decoded payload dict or None if invalid
     """
+    key = hashlib.sha256(token.encode()).hexdigest()
+    with _token_cache_lock:
+        payload = _token_cache.get(key)
+    if payload is not None:
+        return payload
+    
     try:
         payload = jwt.decode(
             token, 
-            settings.SECRET_KEY, 
-            algorithms=[settings.ALGORITHM]
+            _JWT_VERIFY_KEY, 
+            algorithms=_JWT_ALGORITHMS,
+            options=_DECODE_OPTIONS
         )
-        return payload
-    except JWTError:
+    except jwt.PyJWTError:
         return None
+    
+    # Failures are never cached
+    with _token_cache_lock:
+        _token_cache[key] = payload
+    return payload
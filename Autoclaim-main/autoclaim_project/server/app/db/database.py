@@ -3,36 +3,103 @@ Database configuration and session management.
 Provides SQLAlchemy engine, session factory, and dependency.
 """
 
-from sqlalchemy import create_engine
+import orjson
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 
 from app.core.config import settings
 
 # Create SQLAlchemy engine
 # For SQLite, we need check_same_thread=False to allow multiple threads
+_is_sqlite = settings.DATABASE_URL.startswith("sqlite")
+_is_sqlite_memory = _is_sqlite and settings.DATABASE_URL in ("sqlite://", "sqlite:///:memory:")
+
+if _is_sqlite:
+    engine_kwargs = {"connect_args": {"check_same_thread": False}}
+    if _is_sqlite_memory:
+        # Every connection to :memory: is a separate database - share one
+        engine_kwargs["poolclass"] = StaticPool
+else:
+    # LIFO checkout keeps a few hot connections busy and lets idle overflow ones expire;
+    # pre_ping/recycle stop get_db from handing out dead connections
+    engine_kwargs = {
+        "pool_size": 20,
+        "max_overflow": 40,
+        "pool_timeout": 30,
+        "pool_recycle": 1800,
+        "pool_pre_ping": True,
+        "pool_use_lifo": True,
+    }
+
+def _json_serializer(value) -> str:
+    """orjson for JSON columns; also handles datetimes and numpy values in AI results."""
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY).decode()
+
+
 engine = create_engine(
     settings.DATABASE_URL,
-    connect_args={"check_same_thread": False} if settings.DATABASE_URL.startswith("sqlite") else {}
+    json_serializer=_json_serializer,
+    json_deserializer=orjson.loads,
+    **engine_kwargs
 )
 
+
+if _is_sqlite:
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_conn, connection_record):
+        """WAL lets readers run during writes; the rest trims fsyncs and syscalls."""
+        cursor = dbapi_conn.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA mmap_size=268435456")  # 256 MB
+        cursor.execute("PRAGMA cache_size=-65536")  # 64 MB
+        cursor.close()
+
 # Session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# expire_on_commit=False: committed objects keep their loaded state instead of
+# re-selecting wide rows (e.g. ForensicAnalysis) on the next attribute access
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
 
 # Base class for models
 Base = declarative_base()
 
+# Backends whose INSERT supports ON CONFLICT (on_conflict_do_nothing / do_update)
+_DIALECT_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
+def dialect_insert(table):
+    """
+    INSERT construct for the configured backend.
+    
+    On PostgreSQL and SQLite this is the dialect insert, which adds
+    on_conflict_do_nothing() / on_conflict_do_update(). Other backends
+    get the generic insert().
+    """
+    return _DIALECT_INSERTS.get(engine.dialect.name, insert)(table)
+
 
 def get_db():
     """
     Database session dependency.
     
-    Yields a database session and ensures it's closed after use.
+    Yields a database session, rolls back on errors and releases
+    every loaded object once the request is done.
     Use with FastAPI's Depends():
         db: Session = Depends(get_db)
     """
     db = SessionLocal()
     try:
         yield db
+    except Exception:
+        db.rollback()
+        raise
     finally:
+        db.expunge_all()
         db.close()
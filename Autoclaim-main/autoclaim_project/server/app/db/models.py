@@ -3,29 +3,58 @@ Database models for the AutoClaim system.
 """
 
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Float, Text, Boolean, JSON
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Float, Text, Boolean, JSON, Index
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import relationship, deferred
+from sqlalchemy.sql.expression import FunctionElement
 from app.db.database import Base
 
+__all__ = [
+    "Base", "User", "PolicyPlan", "Policy", "ForensicAnalysis", "Claim",
+    "DamagedPanel", "RepairLineItem", "RiskFlag",
+]
+
+# JSONB on PostgreSQL (binary storage, faster reads, indexable), JSON elsewhere
+JSONBType = JSON().with_variant(JSONB(), "postgresql")
+
+
+class utcnow(FunctionElement):
+    """Current UTC time as a column server default (the columns are timezone-naive UTC)."""
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(utcnow)
+def _utcnow_default(element, compiler, **kw):
+    # SQLite's CURRENT_TIMESTAMP is already UTC
+    return "CURRENT_TIMESTAMP"
+
+
+@compiles(utcnow, "postgresql")
+def _utcnow_postgresql(element, compiler, **kw):
+    # Plain now() would be stored in the session time zone
+    return "timezone('utc', now())"
+
 
 class User(Base):
     """User accounts for the insurance system."""
     __tablename__ = "users"
     
     id = Column(Integer, primary_key=True, index=True)
-    email = Column(String, unique=True, index=True, nullable=False)
+    email = Column(String(254), unique=True, index=True, nullable=False)
     hashed_password = Column(String, nullable=False)
-    role = Column(String, default="user")  # user, admin
-    created_at = Column(DateTime, default=datetime.utcnow)
+    role = Column(String(16), default="user")  # user, admin
+    created_at = Column(DateTime, default=datetime.utcnow, server_default=utcnow())
     
     # User profile fields
     name = Column(String, nullable=True)
-    policy_id = Column(String, nullable=True)
-    vehicle_number = Column(String, nullable=True)
+    policy_id = Column(String(32), nullable=True)
+    vehicle_number = Column(String(20), nullable=True)
     
-    # Relationships
-    claims = relationship("Claim", back_populates="user")
-    policies = relationship("Policy", back_populates="user")
+    # Relationships (collections are never walked lazily - query them explicitly)
+    claims = relationship("Claim", back_populates="user", lazy="raise")
+    policies = relationship("Policy", back_populates="user", lazy="raise")
 
 
 class PolicyPlan(Base):
@@ -37,7 +66,7 @@ class PolicyPlan(Base):
     description = Column(Text, nullable=True)
     coverage_amount = Column(Integer, nullable=False)
     premium_monthly = Column(Integer, nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=datetime.utcnow, server_default=utcnow())
     
     # Relationships
     policies = relationship("Policy", back_populates="plan")
@@ -49,22 +78,27 @@ class Policy(Base):
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    plan_id = Column(Integer, ForeignKey("policy_plans.id"), nullable=False)
+    plan_id = Column(Integer, ForeignKey("policy_plans.id"), nullable=False, index=True)
     
     # Vehicle details
     vehicle_make = Column(String, nullable=True)
     vehicle_model = Column(String, nullable=True)
     vehicle_year = Column(Integer, nullable=True)
-    vehicle_registration = Column(String, nullable=True)  # License plate
+    vehicle_registration = Column(String(20), nullable=True)  # License plate
     start_date = Column(DateTime, nullable=False)
     end_date = Column(DateTime, nullable=False)
-    status = Column(String, default="active")  # active, expired, cancelled
-    created_at = Column(DateTime, default=datetime.utcnow)
+    status = Column(String(16), default="active")  # active, expired, cancelled
+    created_at = Column(DateTime, default=datetime.utcnow, server_default=utcnow())
     
     # Relationships
     user = relationship("User", back_populates="policies")
     plan = relationship("PolicyPlan", back_populates="policies")
     claims = relationship("Claim", back_populates="policy")
+    
+    # Also serves plain user_id lookups
+    __table_args__ = (
+        Index("ix_policy_user_status", "user_id", "status"),
+    )
 
 
 class ForensicAnalysis(Base):
@@ -92,13 +126,13 @@ class ForensicAnalysis(Base):
     # ============================================================
     ocr_plate_text = Column(String, nullable=True)
     ocr_plate_confidence = Column(Float, nullable=True)
-    ocr_raw_texts = Column(JSON, default=list)
+    ocr_raw_texts = deferred(Column(JSON, default=list), group="raw")
     
     # ============================================================
     # YOLO DAMAGE DETECTION (Self-hosted)
     # ============================================================
     yolo_damage_detected = Column(Boolean, default=False)
-    yolo_detections = Column(JSON, default=list)  # Array of detection objects
+    yolo_detections = deferred(Column(JSON, default=list), group="raw")  # Array of detection objects
     yolo_severity = Column(String, nullable=True)  # minor, moderate, severe
     yolo_summary = Column(Text, nullable=True)
     
@@ -116,12 +150,12 @@ class ForensicAnalysis(Base):
     # Legacy fields (computed from extracted data)
     authenticity_score = Column(Float, nullable=True)  # 0-100 (computed)
     forgery_detected = Column(Boolean, default=False)  # computed
-    forgery_indicators = Column(JSON, default=list)  # Array of manipulation signs
+    forgery_indicators = deferred(Column(JSON, default=list), group="forensics")  # Array of manipulation signs
     
     # ============================================================
     # VEHICLE IDENTIFICATION (Groq AI - Identity Extraction)
     # ============================================================
-    detected_objects = Column(JSON, default=list)  # ["car", "damage_area"]
+    detected_objects = deferred(Column(JSON, default=list), group="forensics")  # ["car", "damage_area"]
     vehicle_make = Column(String, nullable=True)
     vehicle_model = Column(String, nullable=True)
     vehicle_year = Column(String, nullable=True)
@@ -139,18 +173,18 @@ class ForensicAnalysis(Base):
     # DAMAGE ASSESSMENT (AI Extraction + Computed)
     # ============================================================
     ai_damage_detected = Column(Boolean, default=False)
-    ai_damaged_panels = Column(JSON, default=list)  # Array of panel names from AI
+    ai_damaged_panels = deferred(Column(JSON, default=list), group="damage")  # Array of panel names from AI
     ai_damage_type = Column(String, nullable=True)  # dent|scratch|crack|shatter|crush|tear|missing
     damage_severity_score = Column(Float, nullable=True)  # 0.00-1.00 from AI extraction
     ai_severity = Column(String, nullable=True)  # Computed: none, minor, moderate, severe, totaled
-    ai_affected_parts = Column(JSON, default=list)  # List of panel names (deprecated, use ai_damaged_panels)
+    ai_affected_parts = deferred(Column(JSON, default=list), group="damage")  # List of panel names (deprecated, use ai_damaged_panels)
     impact_point = Column(String, nullable=True)  # front_center|front_left|front_right|side_left|side_right|rear_center|multiple
     
     # Specific Damage Indicators (Extracted)
     paint_damage = Column(Boolean, default=False)
     glass_damage = Column(Boolean, default=False)
     is_rust_present = Column(Boolean, default=False)
-    rust_locations = Column(JSON, default=list)
+    rust_locations = deferred(Column(JSON, default=list), group="damage")
     is_dirt_in_damage = Column(Boolean, default=False)
     is_paint_faded_around_damage = Column(Boolean, default=False)
     airbags_deployed = Column(Boolean, default=False)
@@ -162,13 +196,13 @@ class ForensicAnalysis(Base):
     # Cost Estimation
     ai_cost_min = Column(Integer, nullable=True)
     ai_cost_max = Column(Integer, nullable=True)
-    repair_cost_breakdown = Column(JSON, nullable=True)  # Part-by-part breakdown [{part, inr_min, inr_max, ...}]
+    repair_cost_breakdown = deferred(Column(JSONBType, nullable=True), group="damage")  # Part-by-part breakdown [{part, inr_min, inr_max, ...}]
     
     # ============================================================
     # PRE-EXISTING DAMAGE DETECTION (Computed from extracted indicators)
     # ============================================================
     pre_existing_damage_detected = Column(Boolean, default=False)  # Computed
-    pre_existing_indicators = Column(JSON, default=list)  # Computed from rust, dirt, faded paint
+    pre_existing_indicators = deferred(Column(JSON, default=list), group="forensics")  # Computed from rust, dirt, faded paint
     pre_existing_description = Column(Text, nullable=True)  # Computed
     pre_existing_confidence = Column(Float, nullable=True)  # Computed
     
@@ -191,7 +225,7 @@ class ForensicAnalysis(Base):
     # ============================================================
     # RISK ASSESSMENT & FLAGS (Rule-Based Computed)
     # ============================================================
-    ai_risk_flags = Column(JSON, default=list)  # Array of risk flag strings (COMPUTED)
+    ai_risk_flags = deferred(Column(JSON, default=list), group="forensics")  # Array of risk flag strings (COMPUTED)
     fraud_probability = Column(String, nullable=True)  # VERY_LOW, LOW, MEDIUM, HIGH (COMPUTED)
     fraud_score = Column(Float, nullable=True)  # 0.0-1.0 (COMPUTED)
     
@@ -206,14 +240,14 @@ class ForensicAnalysis(Base):
     # ============================================================
     # METADATA & RAW DATA
     # ============================================================
-    ai_raw_response = Column(JSON, nullable=True)  # Complete Groq JSON response
+    ai_raw_response = deferred(Column(JSON, nullable=True), group="raw")  # Complete Groq JSON response
     ai_provider = Column(String, default="groq")  # groq, yolo, etc
     ai_model = Column(String, nullable=True)  # Model version used
-    analyzed_at = Column(DateTime, default=datetime.utcnow)
-    analysis_version = Column(String, default="3.0")  # v3.0: Pure extraction + rule-based decisions
+    analyzed_at = Column(DateTime, default=datetime.utcnow, server_default=utcnow(), onupdate=datetime.utcnow)
+    analysis_version = Column(String(16), default="3.0")  # v3.0: Pure extraction + rule-based decisions
     
     # Relationship
-    claim = relationship("Claim", back_populates="forensic_analysis")
+    claim = relationship("Claim", back_populates="forensic_analysis", lazy="raise")
 
 
 class Claim(Base):
@@ -222,11 +256,11 @@ class Claim(Base):
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    policy_id = Column(Integer, ForeignKey("policies.id"), nullable=True)
+    policy_id = Column(Integer, ForeignKey("policies.id"), nullable=True, index=True)
     description = Column(Text, nullable=True)
     image_paths = Column(JSON, default=list)  # Damage images
-    status = Column(String, default="pending")  # pending, processing, completed, approved, rejected, failed
-    created_at = Column(DateTime, default=datetime.utcnow)
+    status = Column(String(16), default="pending")  # pending, processing, completed, approved, rejected, failed
+    created_at = Column(DateTime, default=datetime.utcnow, server_default=utcnow())
     
     # Upload paths
     front_image_path = Column(String, nullable=True)
@@ -242,3 +276,49 @@ class Claim(Base):
     user = relationship("User", back_populates="claims")
     policy = relationship("Policy", back_populates="claims")
     forensic_analysis = relationship("ForensicAnalysis", back_populates="claim", uselist=False)
+    
+    # /claims/my filters by user and sorts newest first; /claims/all sorts by date.
+    # ix_claim_user_created also serves plain user_id lookups.
+    __table_args__ = (
+        Index("ix_claim_user_created", "user_id", created_at.desc()),
+        Index("ix_claim_created", created_at.desc()),
+        Index("ix_claim_user_status_created", "user_id", "status", created_at.desc()),
+    )
+
+
+# ============================================================
+# NORMALIZED FORENSIC ARRAYS
+# Row-per-item copies of the ForensicAnalysis JSON arrays so aggregates
+# ("claims with a cracked windshield", "most common risk flag") run in SQL.
+# The JSON columns remain the source for the claim detail view.
+# ============================================================
+
+class DamagedPanel(Base):
+    """One damaged panel reported for a claim."""
+    __tablename__ = "damaged_panels"
+    
+    id = Column(Integer, primary_key=True)
+    claim_id = Column(Integer, ForeignKey("claims.id"), nullable=False, index=True)
+    panel = Column(String, nullable=False, index=True)
+    severity = Column(String, nullable=True)  # Claim-level ai_severity at analysis time
+
+
+class RepairLineItem(Base):
+    """One priced part from the repair cost breakdown."""
+    __tablename__ = "repair_line_items"
+    
+    id = Column(Integer, primary_key=True)
+    claim_id = Column(Integer, ForeignKey("claims.id"), nullable=False, index=True)
+    panel_key = Column(String, nullable=True, index=True)
+    part = Column(String, nullable=False)
+    inr_min = Column(Integer, nullable=True)
+    inr_max = Column(Integer, nullable=True)
+
+
+class RiskFlag(Base):
+    """One risk flag raised for a claim."""
+    __tablename__ = "risk_flags"
+    
+    id = Column(Integer, primary_key=True)
+    claim_id = Column(Integer, ForeignKey("claims.id"), nullable=False, index=True)
+    flag = Column(String, nullable=False, index=True)
@@ -3,22 +3,34 @@ AutoClaim Server - Main FastAPI Application.
 Insurance claim processing with AI-powered damage analysis.
 """
 
+import asyncio
+import os
+import threading
+import time
+
+from cachetools import TTLCache
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-import os
 
 from app.core.config import settings
-from app.db.database import engine
-from app.db import models
+from app.core.responses import OrjsonResponse
+from app import bootstrap
 from app.api import auth, claims
 from app.services import ai_orchestrator
 
+try:
+    from app.services.yolov8_damage_service import get_model_info as _get_model_info
+except ImportError:
+    _get_model_info = None
+
 # Create FastAPI app
 app = FastAPI(
     title="AutoClaim API",
     description="Insurance claim processing with AI-powered damage analysis",
-    version="2.0.0"
+    version="2.0.0",
+    default_response_class=OrjsonResponse
 )
 
 # Enable CORS for React frontend
@@ -30,60 +42,76 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Create database tables
-models.Base.metadata.create_all(bind=engine)
-
 # Include routers
 app.include_router(auth.router)
 app.include_router(claims.router)
 
+class CachedStatFiles(StaticFiles):
+    """
+    StaticFiles that remembers successful path lookups for a few seconds.
+    Upload names include a content hash and existing files are never
+    overwritten (see save_upload_file), so repeated image requests
+    can skip the realpath + os.stat syscalls. Misses are not cached so a
+    freshly uploaded file is served immediately.
+    In production, serving /uploads from nginx (sendfile) avoids Python entirely.
+    """
+    
+    def __init__(self, *args, stat_ttl: float = 5.0, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._lookup_cache = TTLCache(maxsize=4096, ttl=stat_ttl)
+        self._lookup_lock = threading.Lock()
+    
+    def lookup_path(self, path: str):
+        with self._lookup_lock:
+            cached = self._lookup_cache.get(path)
+        if cached is not None:
+            return cached
+        
+        result = super().lookup_path(path)
+        if result[1] is not None:
+            with self._lookup_lock:
+                self._lookup_cache[path] = result
+        return result
+
+
 # Serve uploaded files (images, documents)
 UPLOADS_DIR = os.path.join(os.path.dirname(__file__), "..", "uploads")
 os.makedirs(UPLOADS_DIR, exist_ok=True)
-app.mount("/uploads", StaticFiles(directory=UPLOADS_DIR), name="uploads")
+app.mount("/uploads", CachedStatFiles(directory=UPLOADS_DIR), name="uploads")
 
 
 @app.on_event("startup")
 async def startup_event():
-    """Initialize AI services and create admin user on server startup."""
+    """Initialize AI services and, if enabled, bootstrap the database on startup."""
     print("🚀 Starting AutoClaim server...")
     
     # Initialize AI services
     ai_status = ai_orchestrator.initialize_services()
     print(f"✅ AI Services: {ai_status}")
     
-    # Create default admin user if it doesn't exist
-    try:
-        from app.db.database import SessionLocal
-        from app.core.security import get_password_hash
-        
-        db = SessionLocal()
+    # Log password hash cost so ops can raise rounds as hardware improves
+    # (timed on the password executor so startup doesn't block the event loop)
+    from app.core.security import benchmark_password_hash_async
+    hash_ms = await benchmark_password_hash_async()
+    print(f"✅ Password hash time: {hash_ms:.0f} ms (bcrypt cost {settings.BCRYPT_ROUNDS})")
+    
+    # Create tables and the default admin user (one-shot: `python -m app.bootstrap`)
+    if settings.RUN_MIGRATIONS:
         try:
-            # Hardcoded admin credentials
-            ADMIN_EMAIL = "admin@autoclaim.com"
-            ADMIN_PASSWORD = "admin123"
-            
-            admin = db.query(models.User).filter(models.User.email == ADMIN_EMAIL).first()
-            if not admin:
-                admin = models.User(
-                    email=ADMIN_EMAIL,
-                    hashed_password=get_password_hash(ADMIN_PASSWORD),
-                    role="admin",
-                    name="System Administrator"
-                )
-                db.add(admin)
-                db.commit()
-                print(f"✅ Admin user created: {ADMIN_EMAIL} / {ADMIN_PASSWORD}")
-            else:
-                print(f"✅ Admin user exists: {ADMIN_EMAIL}")
-        finally:
-            db.close()
-    except Exception as e:
-        print(f"⚠️  Admin user creation failed: {e}")
+            await asyncio.get_running_loop().run_in_executor(None, bootstrap.create_tables)
+            await bootstrap.ensure_admin_user_async()
+        except Exception as e:
+            print(f"⚠️  Database bootstrap failed: {e}")
     
     print(f"✅ Server ready!")
 
 
+@app.on_event("shutdown")
+def shutdown_event():
+    """Stop the YOLO worker processes."""
+    ai_orchestrator.shutdown_services()
+
+
 @app.get("/")
 def root():
     """API root endpoint."""
@@ -94,12 +122,30 @@ def root():
     }
 
 
+# Health probes hit /health every few seconds; the model info (GPU check
+# included) only needs refreshing every HEALTH_CACHE_SECONDS
+HEALTH_CACHE_SECONDS = 10.0
+_model_info_cache = {"expires": 0.0, "info": {}}
+
+
+def _cached_model_info() -> dict:
+    """Model info from the YOLOv8 service, refreshed at most every 10s."""
+    now = time.monotonic()
+    if now >= _model_info_cache["expires"]:
+        try:
+            info = _get_model_info() if _get_model_info else {}
+        except Exception as e:
+            print(f"⚠️  Model info unavailable: {e}")
+            info = {}
+        _model_info_cache["info"] = info
+        _model_info_cache["expires"] = now + HEALTH_CACHE_SECONDS
+    return _model_info_cache["info"]
+
+
 @app.get("/health")
 def health_check():
     """Health check endpoint with AI service status."""
-    from app.services.yolov8_damage_service import get_model_info
-    
-    model_info = get_model_info()
+    model_info = _cached_model_info()
     
     return {
         "status": "healthy",
@@ -3,32 +3,124 @@ AI Service Orchestrator - Pure Data Extraction + Rule-Based Decisions.
 Combines self-hosted YOLOv8 with Groq for data extraction, then applies Python rules for decisions.
 """
 
+import asyncio
+import logging
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, List, Optional
 
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
 # Import individual services
-from app.services.exif_service import extract_metadata
+from app.services.exif_service import extract_metadata, metadata_from_cache
 from app.services.ocr_service import extract_number_plate
+from app.services.result_cache import cached_image_stage, combined_key, get_cached, image_key, set_cached
 
 # Import YOLOv8 self-hosted service
 try:
     from app.services.yolov8_damage_service import (
-        detect_vehicle_damage,
+        detect_vehicle_damage_batch,
         init_yolo_model,
         get_model_info,
+        start_worker_pool,
+        stop_worker_pool,
         YOLO_AVAILABLE
     )
 except ImportError:
     YOLO_AVAILABLE = False
-    print("[WARNING] YOLOv8 service not available")
+    logger.warning("[WARNING] YOLOv8 service not available")
 
 # Import Groq service for data extraction
 try:
-    from app.services.groq_service import extract_vehicle_data
+    from app.services.groq_service import extract_vehicle_data, precompute_b64_payloads
     GROQ_AVAILABLE = True
 except ImportError:
     GROQ_AVAILABLE = False
-    print("[WARNING] Groq service not available")
+    logger.warning("[WARNING] Groq service not available")
+
+# Import rule-based verification engine
+try:
+    from app.services.verification_rules import VerificationRules
+    VERIFICATION_AVAILABLE = True
+except ImportError:
+    VERIFICATION_AVAILABLE = False
+    logger.warning("[WARNING] Verification rules not available")
+
+# Shared pool for the independent per-claim stages (EXIF, OCR, YOLO, Groq).
+# They are disk/GPU/network bound, so they overlap well on threads.
+_pipeline_pool = ThreadPoolExecutor(max_workers=os.cpu_count() or 4, thread_name_prefix="ai-pipeline")
+
+# Cap on concurrent Groq calls across all claims being analyzed in this process.
+# A thread semaphore because every claim runs its own event loop (asyncio.run).
+_groq_slots = threading.BoundedSemaphore(int(os.getenv("AI_CONCURRENCY", "8")))
+
+# AI_FAST_PATH=1: skip Groq when YOLOv8 ran on every image and found nothing
+_FAST_PATH = os.getenv("AI_FAST_PATH", "0") == "1"
+
+# VerificationRules keeps per-claim state between its checks, so claims analyzed
+# at the same time can't share one engine; each worker thread reuses its own.
+_verifier_local = threading.local()
+
+
+def _get_verifier():
+    """This thread's VerificationRules engine (created on first use)."""
+    verifier = getattr(_verifier_local, "engine", None)
+    if verifier is None:
+        if not VERIFICATION_AVAILABLE:
+            raise RuntimeError("verification rules not available")
+        verifier = _verifier_local.engine = VerificationRules()
+    return verifier
+
+
+# Fields copied straight across by prepare_verification_data():
+# (section, output key, source, source key, default)
+_VERIFICATION_FIELDS = (
+    # EXIF Metadata
+    ("exif_metadata", "timestamp", "metadata", "timestamp", None),
+    ("exif_metadata", "location_name", "metadata", "location_name", None),
+    ("exif_metadata", "camera_make", "metadata", "camera_make", None),
+    ("exif_metadata", "camera_model", "metadata", "camera_model", None),
+    # OCR Data
+    ("ocr_data", "plate_text", "ocr", "plate_text", None),
+    # YOLO Results
+    ("yolo_results", "yolo_damage_detected", "yolo_damage", "damage_detected", False),
+    ("yolo_results", "yolo_severity", "yolo_damage", "severity", "none"),
+    # Vehicle Identification
+    ("vehicle_identification", "make", "identity", "vehicle_make", None),
+    ("vehicle_identification", "model", "identity", "vehicle_model", None),
+    ("vehicle_identification", "year", "identity", "vehicle_year", None),
+    ("vehicle_identification", "color", "identity", "vehicle_color", None),
+    ("vehicle_identification", "detected_confidence", "identity", "identification_confidence", 0.0),
+    ("vehicle_identification", "license_plate_visible", "identity", "license_plate_visible", False),
+    ("vehicle_identification", "license_plate_obscured", "identity", "license_plate_obscured", False),
+    # Forensic Indicators
+    ("forensic_indicators", "is_screen_recapture", "forensics", "is_screen_recapture", False),
+    ("forensic_indicators", "has_ui_elements", "forensics", "has_ui_elements", False),
+    ("forensic_indicators", "has_watermarks", "forensics", "has_watermarks", False),
+    ("forensic_indicators", "image_quality", "forensics", "image_quality", "high"),
+    ("forensic_indicators", "is_blurry", "forensics", "is_blurry", False),
+    ("forensic_indicators", "multiple_light_sources", "forensics", "multiple_light_sources", False),
+    ("forensic_indicators", "shadows_inconsistent", "forensics", "shadows_inconsistent", False),
+    # Damage Assessment
+    ("damage_assessment", "ai_damage_detected", "damage", "damage_detected", False),
+    ("damage_assessment", "ai_severity", "damage", "severity", "none"),
+    ("damage_assessment", "damage_type", "damage", "damage_type", None),
+    ("damage_assessment", "severity_score", "damage", "severity_score", 0.0),
+    ("damage_assessment", "airbags_deployed", "damage", "airbags_deployed", False),
+    ("damage_assessment", "fluid_leaks_visible", "damage", "fluid_leaks_visible", False),
+    ("damage_assessment", "parts_missing", "damage", "parts_missing", False),
+    ("damage_assessment", "ai_cost_min", "damage", "cost_estimate_min", None),
+    ("damage_assessment", "ai_cost_max", "damage", "cost_estimate_max", None),
+    # Pre-existing Indicators
+    ("pre_existing_indicators", "rust_detected", "damage", "is_rust_present", False),
+    ("pre_existing_indicators", "paint_fading", "damage", "is_paint_faded_around_damage", False),
+    ("pre_existing_indicators", "dirt_accumulation", "damage", "is_dirt_in_damage", False),
+    # Narrative Consistency
+    ("narrative_consistency", "visual_evidence_matches", "scene", "consistent_with_narrative", True),
+)
 
 
 def prepare_verification_data(
@@ -49,63 +141,38 @@ def prepare_verification_data(
     Returns:
         dict structured for VerificationRules.verify_claim()
     """
-    identity = extracted_data.get("identity", {})
-    damage = extracted_data.get("damage", {})
     forensics = extracted_data.get("forensics", {})
-    scene = extracted_data.get("scene", {})
+    damage = extracted_data.get("damage", {})
+    sources = {
+        "metadata": metadata,
+        "ocr": ocr,
+        "yolo_damage": yolo_damage,
+        "identity": extracted_data.get("identity", {}),
+        "damage": damage,
+        "forensics": forensics,
+        "scene": extracted_data.get("scene", {}),
+    }
     
-    # Build the comprehensive analysis structure
+    # Derived and constant fields; fresh lists/dicts on every call
     ai_analysis = {
-        # EXIF Metadata
         "exif_metadata": {
-            "timestamp": metadata.get("timestamp"),
             "gps_coordinates": {
                 "latitude": metadata.get("gps_lat"),
                 "longitude": metadata.get("gps_lon"),
             },
-            "location_name": metadata.get("location_name"),
-            "camera_make": metadata.get("camera_make"),
-            "camera_model": metadata.get("camera_model"),
         },
-        
-        # OCR Data
         "ocr_data": {
-            "plate_text": ocr.get("plate_text"),
             "confidence": ocr.get("confidence") or 0.0,
             "chase_number": None,  # Not currently extracted
             "chase_number_confidence": 0.0,
         },
-        
-        # YOLO Results
         "yolo_results": {
-            "yolo_damage_detected": yolo_damage.get("damage_detected", False),
-            "yolo_severity": yolo_damage.get("severity", "none"),
             "yolo_detections": yolo_damage.get("detections", []),
+            # Claim-level summary over every image (see aggregate_detections)
+            "yolo_aggregate": yolo_damage.get("aggregate", {}),
         },
-        
-        # Vehicle Identification
-        "vehicle_identification": {
-            "make": identity.get("vehicle_make"),
-            "model": identity.get("vehicle_model"),
-            "year": identity.get("vehicle_year"),
-            "color": identity.get("vehicle_color"),
-            "detected_confidence": identity.get("identification_confidence", 0.0),
-            "license_plate_visible": identity.get("license_plate_visible", False),
-            "license_plate_obscured": identity.get("license_plate_obscured", False),
-        },
-        
-        # Forensic Indicators
-        "forensic_indicators": {
-            "is_screen_recapture": forensics.get("is_screen_recapture", False),
-            "has_ui_elements": forensics.get("has_ui_elements", False),
-            "has_watermarks": forensics.get("has_watermarks", False),
-            "image_quality": forensics.get("image_quality", "high"),
-            "is_blurry": forensics.get("is_blurry", False),
-            "multiple_light_sources": forensics.get("multiple_light_sources", False),
-            "shadows_inconsistent": forensics.get("shadows_inconsistent", False),
-        },
-        
-        # Authenticity Indicators
+        "vehicle_identification": {},
+        "forensic_indicators": {},
         "authenticity_indicators": {
             "stock_photo_likelihood": "unknown",  # Not currently available
             "editing_detected": False,
@@ -113,43 +180,222 @@ def prepare_verification_data(
             "shadows_natural": not forensics.get("shadows_inconsistent", False),
             "compression_uniform": True,
         },
-        
-        # Damage Assessment
         "damage_assessment": {
-            "ai_damage_detected": damage.get("damage_detected", False),
-            "ai_severity": damage.get("severity", "none"),
             "damaged_panels": damage.get("damaged_panels", []),
-            "damage_type": damage.get("damage_type"),
-            "severity_score": damage.get("severity_score", 0.0),
-            "airbags_deployed": damage.get("airbags_deployed", False),
-            "fluid_leaks_visible": damage.get("fluid_leaks_visible", False),
-            "parts_missing": damage.get("parts_missing", False),
-            "ai_cost_min": damage.get("cost_estimate_min"),
-            "ai_cost_max": damage.get("cost_estimate_max"),
         },
-        
-        # Pre-existing Indicators
         "pre_existing_indicators": {
-            "rust_detected": damage.get("is_rust_present", False),
-            "paint_fading": damage.get("is_paint_faded_around_damage", False),
-            "dirt_accumulation": damage.get("is_dirt_in_damage", False),
             "old_repairs_visible": False,
         },
-        
-        # Narrative Consistency
         "narrative_consistency": {
-            "visual_evidence_matches": scene.get("consistent_with_narrative", True),
             "inconsistencies": [],
         },
-        
-        # Multi-image Analysis (placeholder - would need orchestrator to aggregate)
+        # Cross-image consistency flags are not computed yet
         "multi_image_analysis": {},
     }
     
+    for section, out_key, source, source_key, default in _VERIFICATION_FIELDS:
+        ai_analysis[section][out_key] = sources[source].get(source_key, default)
+    
     return ai_analysis
 
 
 
+def _first_usable_metadata(exif_results) -> Optional[Dict[str, Any]]:
+    """First EXIF/filename result (in claim image order) with a timestamp, GPS or parsed filename."""
+    for exif in exif_results:
+        if exif.get("timestamp") or exif.get("gps_lat") or exif.get("filename_parsed"):
+            return exif
+    return None
+
+
+_SEVERITY_RANK = {"none": 0, "minor": 1, "moderate": 2, "severe": 3}
+_SEVERITY_NAMES = tuple(_SEVERITY_RANK)
+
+
+def aggregate_detections(per_image: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Combine per-image YOLOv8 results into one claim-level summary:
+    max/mean confidence, max and mean severity, union of affected parts.
+    Failed images are ignored.
+    """
+    successes = [r for r in per_image if r.get("success")]
+    confidence = np.array(
+        [d["confidence"] for r in successes for d in r.get("detections", [])], dtype=np.float64
+    )
+    severity = np.array(
+        [_SEVERITY_RANK.get(r.get("severity"), 0) for r in successes], dtype=np.int8
+    )
+    counts = np.array([len(r.get("detections", [])) for r in successes], dtype=np.int32)
+    parts = np.unique(
+        np.array([p for r in successes for p in r.get("affected_parts", [])], dtype=str)
+    )
+    
+    return {
+        "images_analyzed": len(successes),
+        "images_with_damage": int(np.count_nonzero(counts)),
+        "total_detections": int(counts.sum()),
+        "max_confidence": float(confidence.max()) if confidence.size else 0.0,
+        "mean_confidence": round(float(confidence.mean()), 4) if confidence.size else 0.0,
+        "max_severity": _SEVERITY_NAMES[int(severity.max())] if severity.size else "none",
+        "mean_severity_score": round(float(severity.mean()), 4) if severity.size else 0.0,
+        "affected_parts": parts.tolist(),
+    }
+
+
+def _run_yolo_detection(image_paths: List[str], yolo_damage: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    YOLOv8 on all images in one batch.
+    The first successful image becomes the primary result (as with the old per-image
+    loop); every image is kept in "per_image" and summarised in "aggregate".
+    """
+    # Only images without a cached result go through the model
+    keys = [f"yolo:{image_key(path)}" for path in image_paths]
+    per_image = [get_cached(key) for key in keys]
+    misses = [i for i, r in enumerate(per_image) if r is None]
+    if misses:
+        fresh = detect_vehicle_damage_batch([image_paths[i] for i in misses])
+        for i, r in zip(misses, fresh):
+            per_image[i] = r
+            if r["success"]:
+                set_cached(keys[i], r)
+    
+    successes = [r for r in per_image if r["success"]]
+    if not successes:
+        yolo_damage["summary"] = per_image[-1].get("error", "YOLOv8 failed")
+        return yolo_damage
+    
+    primary = successes[0]
+    logger.info("[YOLOv8] %s", primary.get("summary", "Detection complete"))
+    return {
+        **primary,
+        "per_image": [
+            {"image_path": path, **r} for path, r in zip(image_paths, per_image)
+        ],
+        "aggregate": aggregate_detections(per_image),
+    }
+
+
+def _extract_vehicle_data_limited(
+    image_paths: List[str],
+    description: str,
+    policy_data: Optional[Dict]
+) -> Dict[str, Any]:
+    """
+    extract_vehicle_data, served from the result cache when the same images,
+    description and policy were already extracted; otherwise waits for a free
+    AI_CONCURRENCY slot.
+    """
+    # Paths are pre-filtered by analyze_claim_async, so every one exists
+    key = f"groq:{combined_key([*map(image_key, image_paths), description, sorted((policy_data or {}).items())])}"
+    cached = get_cached(key)
+    if cached is not None:
+        return cached
+    
+    # Encode the images before taking a slot, so slots only cover the API call
+    image_payloads = precompute_b64_payloads(image_paths)
+    with _groq_slots:
+        extraction_result = extract_vehicle_data(
+            image_paths=image_paths,
+            description=description,
+            policy_data=policy_data,
+            image_payloads=image_payloads
+        )
+    if extraction_result.get("success"):
+        set_cached(key, extraction_result)
+    return extraction_result
+
+
+def _yolo_rules_out_damage(yolo_damage: Dict[str, Any]) -> bool:
+    """True when YOLOv8 succeeded on every image without a single detection above its threshold."""
+    per_image = yolo_damage.get("per_image") or []
+    return bool(per_image) and all(
+        r.get("success") and not r.get("detections") for r in per_image
+    )
+
+
+def _fast_path_extraction(yolo_damage: Dict[str, Any]) -> Dict[str, Any]:
+    """Minimal stand-in for the Groq extraction, so verification still runs on the fast path."""
+    return {
+        "success": True,
+        "provider": "yolo_fast_path",
+        "identity": {},
+        "damage": {
+            "damage_detected": False,
+            "severity": "none",
+            "damaged_panels": [],
+        },
+        "forensics": {},
+        "scene": {},
+        "summary": yolo_damage.get("summary"),
+    }
+
+
+async def _run_stage(func, *args, **kwargs):
+    """Run a blocking stage on the shared pipeline pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_pipeline_pool, lambda: func(*args, **kwargs))
+
+
+async def _skipped():
+    """Placeholder for a stage that does not run."""
+    return None
+
+
+async def _run_vision_pipeline(
+    damage_image_paths: List[str],
+    front_image_path: Optional[str],
+    yolo_damage: Dict[str, Any]
+) -> Dict[str, Any]:
+    """
+    EXIF, OCR and YOLOv8 stages, run concurrently.
+    
+    Args:
+        damage_image_paths: Damage photo paths (already checked to exist)
+        front_image_path: Existing front view image, or None
+        yolo_damage: Default YOLO result, returned (with a summary) when YOLO doesn't run
+        
+    Returns:
+        dict with metadata (or None), ocr (or None) and yolo_damage
+    """
+    async def first_usable_metadata():
+        exif_results = await asyncio.gather(*(
+            _run_stage(
+                cached_image_stage, "exif", p, extract_metadata,
+                include_name=True, from_cache=metadata_from_cache
+            )
+            for p in damage_image_paths
+        ))
+        return _first_usable_metadata(exif_results)
+    
+    # 1. Extract EXIF/filename metadata from first available image
+    # (all images are read in parallel; the first usable one in claim order wins)
+    metadata_task = first_usable_metadata()
+    
+    # 2. Extract number plate from front image
+    if front_image_path:
+        # Empty results are not cached: they also come back when OCR is unavailable
+        ocr_task = _run_stage(
+            cached_image_stage, "ocr", front_image_path, extract_number_plate,
+            should_cache=lambda r: bool(r.get("plate_text"))
+        )
+    else:
+        ocr_task = _skipped()
+    
+    # 3. YOLOv8 damage detection (self-hosted, FREE, FAST)
+    if YOLO_AVAILABLE and damage_image_paths:
+        yolo_task = _run_stage(_run_yolo_detection, damage_image_paths, yolo_damage)
+    else:
+        yolo_task = _skipped()
+        yolo_damage["summary"] = "YOLOv8 not available" if not YOLO_AVAILABLE else "No images provided"
+    
+    metadata, ocr, yolo_result = await asyncio.gather(metadata_task, ocr_task, yolo_task)
+    return {
+        "metadata": metadata,
+        "ocr": ocr,
+        "yolo_damage": yolo_result or yolo_damage,
+    }
+
+
 def analyze_claim(
     damage_image_paths: List[str],
     front_image_path: Optional[str],
@@ -157,6 +403,25 @@ def analyze_claim(
     claim_amount: int = 0,
     policy_data: Optional[Dict] = None,
     claim_history: Optional[List[Dict]] = None
+) -> Dict[str, Any]:
+    """Synchronous wrapper around analyze_claim_async() for scripts and sync callers."""
+    return asyncio.run(analyze_claim_async(
+        damage_image_paths=damage_image_paths,
+        front_image_path=front_image_path,
+        description=description,
+        claim_amount=claim_amount,
+        policy_data=policy_data,
+        claim_history=claim_history
+    ))
+
+
+async def analyze_claim_async(
+    damage_image_paths: List[str],
+    front_image_path: Optional[str],
+    description: str,
+    claim_amount: int = 0,
+    policy_data: Optional[Dict] = None,
+    claim_history: Optional[List[Dict]] = None
 ) -> Dict[str, Any]:
     """
     Perform complete claim analysis using AI extraction + rule-based decisions.
@@ -179,8 +444,6 @@ def analyze_claim(
     Returns:
         dict with metadata, ocr, yolo_damage, ai_analysis, and verification results
     """
-    from app.services.verification_rules import VerificationRules
-    
     result = {
         "metadata": {
             "timestamp": None,
@@ -217,55 +480,54 @@ def analyze_claim(
         "verification": None  # Will hold VerificationResult
     }
     
-    # 1. Extract EXIF/filename metadata from first available image
-    if damage_image_paths:
-        for path in damage_image_paths:
-            if os.path.exists(path):
-                exif = extract_metadata(path)
-                if exif.get("timestamp") or exif.get("gps_lat"):
-                    result["metadata"] = exif
-                    break
-                elif exif.get("filename_parsed"):
-                    result["metadata"] = exif
-                    break
-    
-    # 2. Extract number plate from front image
-    if front_image_path and os.path.exists(front_image_path):
-        result["ocr"] = extract_number_plate(front_image_path)
-    
-    # 3. YOLOv8 damage detection (self-hosted, FREE, FAST)
-    if YOLO_AVAILABLE and damage_image_paths:
-        for path in damage_image_paths:
-            if os.path.exists(path):
-                yolo_result = detect_vehicle_damage(path)
-                if yolo_result["success"]:
-                    result["yolo_damage"] = yolo_result
-                    print(f"[YOLOv8] {yolo_result.get('summary', 'Detection complete')}")
-                    break
-                else:
-                    result["yolo_damage"]["summary"] = yolo_result.get("error", "YOLOv8 failed")
-    else:
-        result["yolo_damage"]["summary"] = "YOLOv8 not available" if not YOLO_AVAILABLE else "No images provided"
+    # One existence check per image; every stage below gets only existing paths
+    existing_damage_paths = [p for p in (damage_image_paths or []) if os.path.exists(p)]
+    front_exists = bool(front_image_path) and os.path.exists(front_image_path)
     
+    # Stages 1-4 are independent: the vision stages and Groq run together
     # 4. Groq data extraction - ALWAYS RUN for insurance claims
-    if GROQ_AVAILABLE:
-        all_images = (damage_image_paths or []).copy()
-        if front_image_path:
+    def start_groq():
+        if not GROQ_AVAILABLE:
+            return _skipped()
+        all_images = existing_damage_paths.copy()
+        if front_exists:
             all_images.append(front_image_path)
         
-        print("[AI] Running Groq data extraction...")
-        extraction_result = extract_vehicle_data(
+        logger.info("[AI] Running Groq data extraction...")
+        return _run_stage(
+            _extract_vehicle_data_limited,
             image_paths=all_images,
             description=description,
             policy_data=policy_data
         )
-        
+    
+    vision_task = _run_vision_pipeline(
+        existing_damage_paths,
+        front_image_path if front_exists else None,
+        result["yolo_damage"]
+    )
+    
+    if _FAST_PATH and GROQ_AVAILABLE and YOLO_AVAILABLE:
+        # YOLO first; Groq only runs when YOLO hasn't ruled out damage
+        vision = await vision_task
+        if _yolo_rules_out_damage(vision["yolo_damage"]):
+            logger.info("[AI] Fast path: YOLOv8 found no damage on any image, skipping Groq")
+            extraction_result = _fast_path_extraction(vision["yolo_damage"])
+        else:
+            extraction_result = await start_groq()
+    else:
+        vision, extraction_result = await asyncio.gather(vision_task, start_groq())
+    if vision["metadata"]:
+        result["metadata"] = vision["metadata"]
+    if vision["ocr"]:
+        result["ocr"] = vision["ocr"]
+    result["yolo_damage"] = vision["yolo_damage"]
+    
+    if GROQ_AVAILABLE:
         if extraction_result.get("success"):
-            # Store extraction results
-            result["ai_analysis"] = {
-                **extraction_result,
-                "provider": "groq",
-            }
+            # Store extraction results (by reference; the extraction dict is ours to extend)
+            extraction_result.setdefault("provider", "groq")
+            result["ai_analysis"] = extraction_result
             
             # 5. Apply comprehensive rule-based verification
             try:
@@ -278,8 +540,7 @@ def analyze_claim(
                 )
                 
                 # Run verification engine
-                verification_engine = VerificationRules()
-                verification_result = verification_engine.verify_claim(
+                verification_result = _get_verifier().verify_claim(
                     claim_amount=claim_amount,
                     ai_analysis=verification_data,
                     policy_data=policy_data or {},
@@ -289,11 +550,14 @@ def analyze_claim(
                 # Store verification results
                 result["verification"] = verification_result.to_dict()
                 
-                print(f"[Verification] Status: {verification_result.status}, "
-                      f"Confidence: {verification_result.confidence_level}, "
-                      f"Score: {verification_result.severity_score:.1f}, "
-                      f"Passed: {len(verification_result.passed_checks)}, "
-                      f"Failed: {len(verification_result.failed_checks)}")
+                logger.info(
+                    "[Verification] Status: %s, Confidence: %s, Score: %.1f, Passed: %d, Failed: %d",
+                    verification_result.status,
+                    verification_result.confidence_level,
+                    verification_result.severity_score,
+                    len(verification_result.passed_checks),
+                    len(verification_result.failed_checks)
+                )
                 
                 # Also add key verification fields to ai_analysis for backward compatibility
                 result["ai_analysis"]["verification_status"] = verification_result .status
@@ -305,7 +569,7 @@ def analyze_claim(
                 result["ai_analysis"]["ai_reasoning"] = verification_result.decision_reason
                 
             except Exception as e:
-                print(f"[Verification] Error: {e}")
+                logger.error("[Verification] Error: %s", e)
                 result["verification"] = {"error": str(e)}
                 # Fall back to extraction-only results
                 result["ai_analysis"]["ai_reasoning"] = f"Verification engine error: {e}"
@@ -334,15 +598,21 @@ def initialize_services() -> Dict[str, bool]:
         "groq": GROQ_AVAILABLE
     }
     
-    # Initialize YOLOv8 model on startup
+    # Initialize YOLOv8 model on startup (in per-GPU worker processes when enabled)
     if YOLO_AVAILABLE:
-        status["yolo"] = init_yolo_model()
+        status["yolo"] = start_worker_pool() or init_yolo_model()
         
         # Print model info
         info = get_model_info()
         gpu_status = "GPU ✓" if info["gpu_info"].get("available") else "CPU (slower)"
-        print(f"[AI Services] YOLOv8: {status['yolo']} ({gpu_status}), Groq: {status['groq']}")
+        logger.info("[AI Services] YOLOv8: %s (%s, %s), Groq: %s", status["yolo"], gpu_status, info.get("backend"), status["groq"])
     else:
-        print(f"[AI Services] YOLOv8: {status['yolo']}, Groq: {status['groq']}")
+        logger.info("[AI Services] YOLOv8: %s, Groq: %s", status["yolo"], status["groq"])
     
     return status
+
+
+def shutdown_services() -> None:
+    """Release AI service resources (YOLO worker processes)."""
+    if YOLO_AVAILABLE:
+        stop_worker_pool()
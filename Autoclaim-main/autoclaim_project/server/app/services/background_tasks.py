@@ -3,136 +3,197 @@ Background task service for asynchronous AI processing.
 Handles claim analysis without blocking the API response.
 """
 
-import traceback
+import asyncio
+import logging
+from datetime import datetime, timedelta
 from typing import List, Optional
-from sqlalchemy.orm import Session
+from sqlalchemy import insert, or_, update
+from sqlalchemy.orm import Session, joinedload
 
-from app.db.database import SessionLocal
+from app.db.database import SessionLocal, dialect_insert
 from app.db import models
 from app.services import ai_orchestrator
 from app.services.forensic_mapper import map_forensic_to_db
+from app.services.forensic_children import write_forensic_children
 from app.services.repair_estimator_service import estimate_repair_cost
+from app.services.verification_rules import RuleConfig
+
+logger = logging.getLogger(__name__)
+
+
+def _upsert_forensic(db: Session, claim_id: int, forensic_fields: dict) -> None:
+    """
+    Insert or update the claim's forensic analysis row in one statement
+    (INSERT ... ON CONFLICT (claim_id) DO UPDATE; claim_id is unique).
+    """
+    stmt = dialect_insert(models.ForensicAnalysis).values(claim_id=claim_id, **forensic_fields)
+    if hasattr(stmt, "on_conflict_do_update"):
+        # ON CONFLICT skips the column's onupdate, so refresh analyzed_at explicitly
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=["claim_id"],
+            set_={**forensic_fields, "analyzed_at": datetime.utcnow()}
+        ))
+        return
+    
+    # Backends without ON CONFLICT: update, and insert only when no row matched
+    # (one statement for re-analysis, two for a first analysis; no SELECT)
+    updated = db.execute(
+        update(models.ForensicAnalysis)
+        .where(models.ForensicAnalysis.claim_id == claim_id)
+        .values(**forensic_fields)
+    ).rowcount
+    if not updated:
+        db.execute(insert(models.ForensicAnalysis).values(claim_id=claim_id, **forensic_fields))
 
 
 def process_claim_ai_analysis(
     claim_id: int,
     damage_image_paths: List[str],
     front_image_path: Optional[str],
-    description: str
+    description: str,
+    reraise: bool = False
 ):
     """
     Background task to process AI analysis for a claim.
     Updates claim status and stores forensic analysis results.
+    Safe to run more than once for the same claim (the claim is re-fetched
+    and all writes are upserts/updates).
     
     Args:
         claim_id: ID of the claim to analyze
         damage_image_paths: List of damage image paths
         front_image_path: Path to front image for OCR
         description: Claim description
+        reraise: Re-raise errors after marking the claim failed, so a task
+            queue can retry it
     """
-    db = SessionLocal()
-    
     try:
-        # Get the claim
-        claim = db.query(models.Claim).filter(models.Claim.id == claim_id).first()
-        if not claim:
-            print(f"[Background Task] Claim {claim_id} not found")
-            return
-        
-        # Update status to processing
-        claim.status = "processing"
-        db.commit()
-        print(f"[Background Task] Processing claim {claim_id}...")
-        
-        # Fetch policy data for verification
-        policy_data = None
-        if claim.policy_id:
-            policy = db.query(models.Policy).filter(models.Policy.id == claim.policy_id).first()
-            if policy:
-                policy_data = {
-                    "vehicle_make": policy.vehicle_make,
-                    "vehicle_model": policy.vehicle_model,
-                    "vehicle_year": policy.vehicle_year,
-                    "vehicle_registration": policy.vehicle_registration,
-                    "status": policy.status,
-                    "start_date": policy.start_date.isoformat() if policy.start_date else None,
-                    "end_date": policy.end_date.isoformat() if policy.end_date else None,
-                    "plan_coverage": policy.plan.coverage_amount if policy.plan else None,
-                    "location": None,  # Not stored in current schema
-                }
-                print(f"[Background Task] Loaded policy data for claim {claim_id}")
-        
-        # Fetch claim history for duplicate detection
-        claim_history = []
-        if claim.user_id:
-            prior_claims = db.query(models.Claim).filter(
-                models.Claim.user_id == claim.user_id,
-                models.Claim.id != claim_id  # Exclude current claim
-            ).all()
-            
-            for prior in prior_claims:
-                claim_history.append({
-                    "claim_id": prior.id,
-                    "status": prior.status,
-                    "created_at": prior.created_at.isoformat() if prior.created_at else None,
-                    "vehicle_registration": prior.vehicle_number_plate,
-                })
-            
-            if claim_history:
-                print(f"[Background Task] Found {len(claim_history)} prior claims for user {claim.user_id}")
-        
-        # Determine claim amount (from estimated cost or default)
-        claim_amount = 0
-        if claim.estimated_cost_max:
-            claim_amount = claim.estimated_cost_max
-        elif claim.estimated_cost_min:
-            claim_amount = claim.estimated_cost_min
-        # If no estimate, verification will use 0 (which may trigger amount threshold checks)
+        # Read phase in its own short session: the pooled connection goes back
+        # before the AI calls instead of being held for their whole duration
+        with SessionLocal() as db:
+            # Claim, policy and plan in one query
+            claim = db.query(models.Claim).options(
+                joinedload(models.Claim.policy).joinedload(models.Policy.plan)
+            ).filter(models.Claim.id == claim_id).first()
+            if not claim:
+                logger.warning("[Background Task] Claim %s not found", claim_id)
+                return
+            
+            # Submission already stores "processing"; only older callers need the update
+            if claim.status != "processing":
+                db.execute(
+                    update(models.Claim)
+                    .where(models.Claim.id == claim_id)
+                    .values(status="processing")
+                )
+                db.commit()
+            logger.info("[Background Task] Processing claim %s...", claim_id)
+            
+            # Fetch policy data for verification
+            policy_data = None
+            if claim.policy_id:
+                policy = claim.policy
+                if policy:
+                    policy_data = {
+                        "vehicle_make": policy.vehicle_make,
+                        "vehicle_model": policy.vehicle_model,
+                        "vehicle_year": policy.vehicle_year,
+                        "vehicle_registration": policy.vehicle_registration,
+                        "status": policy.status,
+                        "start_date": policy.start_date.isoformat() if policy.start_date else None,
+                        "end_date": policy.end_date.isoformat() if policy.end_date else None,
+                        "plan_coverage": policy.plan.coverage_amount if policy.plan else None,
+                        "location": None,  # Not stored in current schema
+                    }
+                    logger.info("[Background Task] Loaded policy data for claim %s", claim_id)
+            
+            # Fetch claim history for duplicate detection
+            claim_history = []
+            if claim.user_id:
+                # The duplicate guard only looks at open claims and claims inside its
+                # window, so older closed claims never leave the database
+                # (one extra day of margin; the guard applies the exact cutoff)
+                window_start = datetime.utcnow() - timedelta(days=RuleConfig.DUPLICATE_CLAIM_WINDOW_DAYS + 1)
+                prior_claims = db.query(
+                    models.Claim.id,
+                    models.Claim.status,
+                    models.Claim.created_at,
+                    models.Claim.vehicle_number_plate
+                ).filter(
+                    models.Claim.user_id == claim.user_id,
+                    models.Claim.id != claim_id,  # Exclude current claim
+                    or_(
+                        models.Claim.status.in_(("pending", "processing")),
+                        models.Claim.created_at >= window_start
+                    )
+                ).order_by(models.Claim.created_at.desc()).all()
+                
+                for prior in prior_claims:
+                    claim_history.append({
+                        "claim_id": prior.id,
+                        "status": prior.status,
+                        "created_at": prior.created_at.isoformat() if prior.created_at else None,
+                        "vehicle_registration": prior.vehicle_number_plate,
+                    })
+                
+                if claim_history:
+                    logger.info("[Background Task] Found %s open or recent prior claims for user %s", len(claim_history), claim.user_id)
+            
+            # Determine claim amount (from estimated cost or default)
+            claim_amount = 0
+            if claim.estimated_cost_max:
+                claim_amount = claim.estimated_cost_max
+            elif claim.estimated_cost_min:
+                claim_amount = claim.estimated_cost_min
+            # If no estimate, verification will use 0 (which may trigger amount threshold checks)
         
         # Perform AI analysis with verification
-        ai_result = ai_orchestrator.analyze_claim(
+        ai_result = asyncio.run(ai_orchestrator.analyze_claim_async(
             damage_image_paths=damage_image_paths,
             front_image_path=front_image_path,
             description=description,
             claim_amount=claim_amount,
             policy_data=policy_data,
             claim_history=claim_history
-        )
+        ))
         
         if ai_result:
+            # Claim column changes, written with the final status in one UPDATE
+            claim_fields = {}
+            
             # Update claim with OCR results
             if ai_result.get("ocr"):
-                claim.vehicle_number_plate = ai_result["ocr"].get("plate_text")
+                claim_fields["vehicle_number_plate"] = ai_result["ocr"].get("plate_text")
             
             # Update claim with verification results (v4.0 - comprehensive rule-based verification)
             if ai_result.get("verification"):
                 verification = ai_result["verification"]
-                claim.ai_recommendation = verification.get("status")  # APPROVED, FLAGGED, REJECTED
+                claim_fields["ai_recommendation"] = verification.get("status")  # APPROVED, FLAGGED, REJECTED
                 
             # Also check legacy decisions field for backward compatibility
             elif ai_result.get("decisions"):
                 decisions = ai_result["decisions"]
-                claim.ai_recommendation = decisions.get("ai_recommendation")
+                claim_fields["ai_recommendation"] = decisions.get("ai_recommendation")
             
             # Create or update forensic analysis
-            forensic_fields = map_forensic_to_db(ai_result)
+            # Policy data lets the mapper compare the plate with the registration
+            forensic_fields = map_forensic_to_db(ai_result, policy_data)
             
             # ── Repair Cost Estimation ───────────────────────────────────────
             # Extract damaged panels and vehicle info from AI result.
             # ai_result["ai_analysis"] is the merged Groq extraction dict which
             # contains sub-keys: damage, identity, forensics, scene.
-            ai_analysis = ai_result.get("ai_analysis", {})
+            ai_analysis = ai_result.get("ai_analysis") or {}
+            damage = ai_analysis.get("damage") or {}
+            identity = ai_analysis.get("identity") or {}
             damaged_panels = (
-                ai_analysis.get("damage", {}).get("damaged_panels")          # Groq nested path
+                damage.get("damaged_panels")                                 # Groq nested path
                 or forensic_fields.get("ai_damaged_panels")                  # already-mapped field
                 or []
             )
-            vehicle_make  = (ai_analysis.get("identity", {}).get("vehicle_make")
-                             or forensic_fields.get("vehicle_make"))
-            vehicle_model = (ai_analysis.get("identity", {}).get("vehicle_model")
-                             or forensic_fields.get("vehicle_model"))
-            vehicle_year  = (ai_analysis.get("identity", {}).get("vehicle_year")
-                             or forensic_fields.get("vehicle_year"))
+            vehicle_make  = identity.get("vehicle_make") or forensic_fields.get("vehicle_make")
+            vehicle_model = identity.get("vehicle_model") or forensic_fields.get("vehicle_model")
+            vehicle_year  = identity.get("vehicle_year") or forensic_fields.get("vehicle_year")
             
             if damaged_panels:
                 cost_estimate = estimate_repair_cost(
@@ -144,61 +205,148 @@ def process_claim_ai_analysis(
                 # Store part-by-part breakdown in forensic fields
                 forensic_fields["repair_cost_breakdown"] = cost_estimate
                 # Update claim cost fields with INR totals from estimator
-                claim.estimated_cost_min = cost_estimate["total_inr_min"]
-                claim.estimated_cost_max = cost_estimate["total_inr_max"]
-                print(f"[Background Task] Repair estimate: "
-                      f"₹{cost_estimate['total_inr_min']:,} – ₹{cost_estimate['total_inr_max']:,} "
-                      f"({len(cost_estimate['breakdown'])} parts)")
+                claim_fields["estimated_cost_min"] = cost_estimate["total_inr_min"]
+                claim_fields["estimated_cost_max"] = cost_estimate["total_inr_max"]
+                # Thousands separators need eager formatting, so only build them when logged
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info(
+                        "[Background Task] Repair estimate: ₹%s – ₹%s (%d parts)",
+                        f"{cost_estimate['total_inr_min']:,}",
+                        f"{cost_estimate['total_inr_max']:,}",
+                        len(cost_estimate["breakdown"])
+                    )
             else:
                 # Fall back to Groq's own INR estimate if no panels detected
-                if ai_result.get("ai_analysis", {}).get("damage", {}).get("estimated_cost_range_INR"):
-                    cost_range = ai_result["ai_analysis"]["damage"]["estimated_cost_range_INR"]
-                    claim.estimated_cost_min = cost_range.get("min")
-                    claim.estimated_cost_max = cost_range.get("max")
+                cost_range = damage.get("estimated_cost_range_INR")
+                if cost_range:
+                    claim_fields["estimated_cost_min"] = cost_range.get("min")
+                    claim_fields["estimated_cost_max"] = cost_range.get("max")
             # ────────────────────────────────────────────────────────────────
             
-            # Check if forensic analysis already exists
-            existing_forensic = db.query(models.ForensicAnalysis).filter(
-                models.ForensicAnalysis.claim_id == claim_id
-            ).first()
-            
-            if existing_forensic:
-                # Update existing forensic analysis
-                for key, value in forensic_fields.items():
-                    setattr(existing_forensic, key, value)
-                print(f"[Background Task] Updated existing forensic analysis for claim {claim_id}")
-            else:
-                # Create new forensic analysis
-                forensic = models.ForensicAnalysis(
-                    claim_id=claim_id,
-                    **forensic_fields
+            # All writes go out in one transaction, committed when the block exits
+            with SessionLocal.begin() as db:
+                # Create or update forensic analysis
+                _upsert_forensic(db, claim_id, forensic_fields)
+                logger.info("[Background Task] Saved forensic analysis for claim %s", claim_id)
+                
+                # Keep the normalized panel / line item / risk flag rows in sync
+                write_forensic_children(db, claim_id, forensic_fields)
+                
+                # Update claim fields and status to completed
+                db.execute(
+                    update(models.Claim)
+                    .where(models.Claim.id == claim_id)
+                    .values(status="completed", **claim_fields)
                 )
-                db.add(forensic)
-                print(f"[Background Task] Created forensic analysis for claim {claim_id}")
-            
-            # Update claim status to completed
-            claim.status = "completed"
-            db.commit()
-            print(f"[Background Task] ✓ Claim {claim_id} analysis completed successfully")
+            logger.info("[Background Task] ✓ Claim %s analysis completed successfully", claim_id)
             
         else:
             # No AI result
-            claim.status = "failed"
-            db.commit()
-            print(f"[Background Task] ✗ Claim {claim_id} analysis failed: No AI result")
+            with SessionLocal.begin() as db:
+                db.execute(
+                    update(models.Claim)
+                    .where(models.Claim.id == claim_id)
+                    .values(status="failed")
+                )
+            logger.error("[Background Task] ✗ Claim %s analysis failed: No AI result", claim_id)
             
     except Exception as e:
         # Handle errors
-        print(f"[Background Task] ✗ Claim {claim_id} analysis failed: {e}")
-        traceback.print_exc()
+        logger.exception("[Background Task] ✗ Claim %s analysis failed: %s", claim_id, e)
         
         try:
-            claim = db.query(models.Claim).filter(models.Claim.id == claim_id).first()
-            if claim:
-                claim.status = "failed"
-                db.commit()
+            with SessionLocal.begin() as db:
+                db.execute(
+                    update(models.Claim)
+                    .where(models.Claim.id == claim_id)
+                    .values(status="failed")
+                )
         except Exception as e2:
-            print(f"[Background Task] Failed to update claim status: {e2}")
+            logger.error("[Background Task] Failed to update claim status: %s", e2)
+        
+        if reraise:
+            raise
+
+
+def process_claim_reanalysis(claim_id: int, reraise: bool = False):
+    """
+    Background task for an admin-triggered re-analysis of a claim.
+    Refreshes the claim quick-access fields and the forensic analysis row;
+    the claim status is left as the reviewer set it.
     
-    finally:
-        db.close()
+    Args:
+        claim_id: ID of the claim to re-analyze
+        reraise: Re-raise errors so a task queue can retry the re-analysis
+    """
+    try:
+        # Short read session; no connection is held during the AI calls
+        with SessionLocal() as db:
+            claim = db.query(models.Claim).filter(models.Claim.id == claim_id).first()
+        if not claim:
+            logger.warning("[Background Task] Claim %s not found", claim_id)
+            return
+        
+        logger.info("[Background Task] Re-analyzing claim %s...", claim_id)
+        ai_result = asyncio.run(ai_orchestrator.analyze_claim_async(
+            damage_image_paths=claim.image_paths or [],
+            front_image_path=claim.front_image_path,
+            description=claim.description or ""
+        ))
+        
+        if not ai_result:
+            logger.error("[Background Task] ✗ Claim %s re-analysis failed: No AI result", claim_id)
+            return
+        
+        metadata = ai_result.get("metadata") or {}
+        ocr = ai_result.get("ocr") or {}
+        analysis = ai_result.get("ai_analysis") or {}
+        
+        # Update claim quick-access fields
+        claim_fields = {}
+        if ocr:
+            claim_fields["vehicle_number_plate"] = ocr.get("plate_text")
+        
+        if analysis:
+            claim_fields["ai_recommendation"] = analysis.get("recommendation")
+            claim_fields["estimated_cost_min"] = analysis.get("cost_min")
+            claim_fields["estimated_cost_max"] = analysis.get("cost_max")
+        
+        # Claim fields, forensic row and child rows in one transaction
+        with SessionLocal.begin() as db:
+            if claim_fields:
+                db.execute(
+                    update(models.Claim)
+                    .where(models.Claim.id == claim_id)
+                    .values(**claim_fields)
+                )
+            
+            # Forensic fields, written in a single statement
+            forensic_fields = {
+                "exif_timestamp": metadata.get("timestamp"),
+                "exif_gps_lat": metadata.get("gps_lat"),
+                "exif_gps_lon": metadata.get("gps_lon"),
+                "exif_location_name": metadata.get("location_name"),
+                "ocr_plate_text": ocr.get("plate_text"),
+                "ocr_plate_confidence": ocr.get("confidence"),
+                "ai_damage_type": analysis.get("damage_type"),
+                "ai_severity": analysis.get("severity"),
+                "ai_affected_parts": analysis.get("affected_parts", []),
+                "ai_recommendation": analysis.get("recommendation"),
+                "ai_reasoning": analysis.get("analysis_text"),
+                "ai_cost_min": analysis.get("cost_min"),
+                "ai_cost_max": analysis.get("cost_max"),
+                "ai_risk_flags": analysis.get("risk_flags", []),
+                "ai_raw_response": ai_result,
+            }
+            
+            # Update or create forensic analysis
+            _upsert_forensic(db, claim_id, forensic_fields)
+            
+            write_forensic_children(db, claim_id, forensic_fields)
+            
+        logger.info("[Background Task] ✓ Claim %s re-analysis completed", claim_id)
+        
+    except Exception as e:
+        logger.exception("[Background Task] ✗ Claim %s re-analysis failed: %s", claim_id, e)
+        if reraise:
+            raise
@@ -4,13 +4,23 @@ Extracts timestamp and GPS location from image EXIF data.
 Falls back to filename parsing when EXIF is not available.
 """
 
+import logging
 import os
 import re
+import struct
+import threading
+import time
+from collections.abc import Mapping
 from datetime import datetime
+from functools import lru_cache
 from typing import Dict, Any, Optional
 from PIL import Image
 from PIL.ExifTags import TAGS, GPSTAGS
 
+from app.services.result_cache import get_cached, set_cached
+
+logger = logging.getLogger(__name__)
+
 # Try to import geocoding
 try:
     from geopy.geocoders import Nominatim
@@ -21,6 +31,15 @@ except ImportError:
 # Initialize geocoder
 geolocator = None
 
+# Nominatim allows one request per second; images are processed in parallel,
+# so requests are serialized and spaced out here
+GEOCODE_MIN_INTERVAL = 1.0
+# Addresses are cached per ~11 m cell (4 decimals) for 30 days
+GEOCODE_PRECISION = 4
+GEOCODE_CACHE_TTL = 30 * 86400
+_geocode_lock = threading.Lock()
+_last_geocode = 0.0
+
 
 def init_geocoder():
     """Initialize the geocoder for reverse geocoding GPS coordinates."""
@@ -33,21 +52,78 @@ def init_geocoder():
             print(f"[ERROR] Geocoder init failed: {e}")
 
 
+def reverse_geocode(lat: float, lon: float) -> Optional[str]:
+    """
+    Address for a coordinate, rate limited to Nominatim's usage policy.
+    Cached per rounded coordinate, since a claim's photos are usually taken
+    at the same spot.
+    """
+    return _reverse_geocode_cached(round(lat, GEOCODE_PRECISION), round(lon, GEOCODE_PRECISION))
+
+
+@lru_cache(maxsize=4096)
+def _reverse_geocode_cached(lat: float, lon: float) -> Optional[str]:
+    # Shared cache first (Redis when configured), then Nominatim
+    key = f"geo:{lat}:{lon}"
+    cached = get_cached(key)
+    if cached is not None:
+        return cached or None
+    
+    global _last_geocode
+    with _geocode_lock:
+        wait = _last_geocode + GEOCODE_MIN_INTERVAL - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        try:
+            location = geolocator.reverse(f"{lat}, {lon}", timeout=5)
+        finally:
+            _last_geocode = time.monotonic()
+    address = location.address if location else None
+    # "" marks a coordinate with no address, so it is not looked up again
+    set_cached(key, address or "", ttl=GEOCODE_CACHE_TTL)
+    return address
+
+
+def _rational_parts(value):
+    """(numerator, denominator) of an EXIF rational: IFDRational, raw (num, den) tuple or number."""
+    if isinstance(value, tuple):
+        return value
+    if hasattr(value, "denominator"):
+        return value.numerator, value.denominator
+    return float(value), 1
+
+
 def convert_gps_to_decimal(gps_coords, ref: str) -> Optional[float]:
     """Convert GPS coordinates from EXIF format to decimal degrees."""
+    # Combine the raw rationals with one division at the end; a zero
+    # denominator (IFDRational would give nan) means the value is unusable
     try:
-        degrees = float(gps_coords[0])
-        minutes = float(gps_coords[1])
-        seconds = float(gps_coords[2])
-        
-        decimal = degrees + (minutes / 60.0) + (seconds / 3600.0)
-        
-        if ref in ["S", "W"]:
-            decimal = -decimal
-        
-        return round(decimal, 6)
-    except:
+        (d_num, d_den), (m_num, m_den), (s_num, s_den) = map(_rational_parts, gps_coords[:3])
+        decimal = (d_num * m_den * s_den * 3600 + m_num * d_den * s_den * 60 + s_num * d_den * m_den) / (
+            d_den * m_den * s_den * 3600
+        )
+    except (TypeError, ValueError, ZeroDivisionError):
         return None
+    
+    if isinstance(ref, bytes):
+        ref = ref.decode(errors="ignore")
+    return round(-decimal if ref in ("S", "W") else decimal, 6)
+
+
+# Filename patterns, tried in order; compiled once at import
+_FILENAME_PATTERNS = tuple((re.compile(pattern), camera) for pattern, camera in (
+    (r"PXL_(\d{4})(\d{2})(\d{2})_(\d{2})(\d{2})(\d{2})", "Google Pixel"),
+    (r"(?:IMG_)?(\d{4})(\d{2})(\d{2})_(\d{2})(\d{2})(\d{2})", "Samsung/Android"),
+    (r"IMG-(\d{4})(\d{2})(\d{2})-WA", "WhatsApp"),
+    (r"Screenshot_(\d{4})(\d{2})(\d{2})-(\d{2})(\d{2})(\d{2})", "Screenshot"),
+    (r"Photo_(\d{4})-(\d{2})-(\d{2})", "iPhone"),
+    (r"VID_(\d{4})(\d{2})(\d{2})_(\d{2})(\d{2})(\d{2})", "Video Screenshot"),
+    (r"(\d{4})(\d{2})(\d{2})", "Unknown Camera"),
+))
+# Every pattern above needs a YYYYMMDD or YYYY-MM-DD run, so one scan for that
+# rules out most names (e.g. content-addressed uploads) before the cascade.
+# The cascade itself stays ordered: the first pattern to match anywhere wins.
+_FILENAME_DATE_HINT = re.compile(r"\d{4}-?\d{2}-?\d{2}")
 
 
 def parse_filename_timestamp(filename: str) -> Dict[str, Any]:
@@ -74,19 +150,11 @@ def parse_filename_timestamp(filename: str) -> Dict[str, Any]:
         return result
     
     basename = os.path.basename(filename)
+    if not _FILENAME_DATE_HINT.search(basename):
+        return result
     
-    patterns = [
-        {"pattern": r"PXL_(\d{4})(\d{2})(\d{2})_(\d{2})(\d{2})(\d{2})", "camera": "Google Pixel"},
-        {"pattern": r"(?:IMG_)?(\d{4})(\d{2})(\d{2})_(\d{2})(\d{2})(\d{2})", "camera": "Samsung/Android"},
-        {"pattern": r"IMG-(\d{4})(\d{2})(\d{2})-WA", "camera": "WhatsApp"},
-        {"pattern": r"Screenshot_(\d{4})(\d{2})(\d{2})-(\d{2})(\d{2})(\d{2})", "camera": "Screenshot"},
-        {"pattern": r"Photo_(\d{4})-(\d{2})-(\d{2})", "camera": "iPhone"},
-        {"pattern": r"VID_(\d{4})(\d{2})(\d{2})_(\d{2})(\d{2})(\d{2})", "camera": "Video Screenshot"},
-        {"pattern": r"(\d{4})(\d{2})(\d{2})", "camera": "Unknown Camera"}
-    ]
-    
-    for p in patterns:
-        match = re.search(p["pattern"], basename)
+    for regex, camera in _FILENAME_PATTERNS:
+        match = regex.search(basename)
         if match:
             groups = match.groups()
             try:
@@ -101,8 +169,11 @@ def parse_filename_timestamp(filename: str) -> Dict[str, Any]:
                 minute = int(groups[4]) if len(groups) > 4 else 0
                 second = int(groups[5]) if len(groups) > 5 else 0
                 
+                if not (0 <= hour <= 23 and 0 <= minute <= 59 and 0 <= second <= 59):
+                    continue
+                
                 result["timestamp"] = datetime(year, month, day, hour, minute, second)
-                result["camera_type"] = p["camera"]
+                result["camera_type"] = camera
                 result["filename_parsed"] = True
                 break
             except (ValueError, IndexError):
@@ -111,6 +182,57 @@ def parse_filename_timestamp(filename: str) -> Dict[str, Any]:
     return result
 
 
+# EXIF IFD pointers inside IFD0
+_EXIF_IFD = 0x8769
+_GPS_IFD = 0x8825
+
+# Tags extract_metadata() reads
+_WANTED_TAG_IDS = frozenset(
+    tag_id for tag_id, name in TAGS.items()
+    if name in ("DateTimeOriginal", "Make", "Model", "GPSInfo")
+)
+
+
+def read_exif_segment(image_path: str) -> Optional[bytes]:
+    """
+    Return the JPEG APP1 "Exif" segment payload, reading only the header bytes.
+    Walks the marker segments after SOI and stops at start-of-scan, so a
+    multi-MB photo costs a few KB of I/O. Returns None for non-JPEG files
+    and b"" for JPEGs without EXIF.
+    """
+    with open(image_path, "rb") as f:
+        if f.read(2) != b"\xff\xd8":
+            return None
+        while True:
+            header = f.read(4)
+            if len(header) < 4 or header[0] != 0xFF:
+                return b""
+            marker = header[1]
+            if marker == 0xDA:  # SOS - image data follows, no more metadata
+                return b""
+            length = struct.unpack(">H", header[2:])[0]
+            if marker == 0xE1:
+                payload = f.read(length - 2)
+                if payload.startswith(b"Exif\x00\x00"):
+                    return payload
+            else:
+                f.seek(length - 2, os.SEEK_CUR)
+
+
+def _exif_from_segment(segment: bytes) -> Dict[Any, Any]:
+    """Flattened tag dict like Image._getexif(): IFD0 + Exif IFD tags, GPSInfo as a dict."""
+    exif = Image.Exif()
+    exif.load(segment)
+    tags = dict(exif)
+    tags.update(exif.get_ifd(_EXIF_IFD))
+    # dict(exif) holds the GPS IFD offset (an int); replace it with the IFD itself
+    gps = exif.get_ifd(_GPS_IFD)
+    tags.pop(_GPS_IFD, None)
+    if gps:
+        tags[_GPS_IFD] = dict(gps)
+    return tags
+
+
 def extract_metadata(image_path: str) -> Dict[str, Any]:
     """
     Extract EXIF metadata from an image.
@@ -135,57 +257,67 @@ def extract_metadata(image_path: str) -> Dict[str, Any]:
     }
     
     try:
-        with Image.open(image_path) as img:
-            exif_data = img._getexif()
-            
-            if exif_data:
-                for tag_id, value in exif_data.items():
-                    tag = TAGS.get(tag_id, tag_id)
-                    
-                    if tag == "DateTimeOriginal":
-                        try:
-                            result["timestamp"] = datetime.strptime(value, "%Y:%m:%d %H:%M:%S")
-                            result["source"] = "exif"
-                        except:
-                            pass
-                    
-                    elif tag == "Make":
-                        result["camera_make"] = str(value).strip()
+        segment = read_exif_segment(image_path)
+        if segment:
+            exif_data = _exif_from_segment(segment)
+        elif segment is not None:
+            # JPEG without an Exif segment: nothing for Pillow to find either
+            exif_data = None
+        else:
+            # Not a JPEG: let Pillow look for EXIF (PNG eXIf chunk, WebP, TIFF)
+            with Image.open(image_path) as img:
+                exif_data = img._getexif() if hasattr(img, "_getexif") else None
+        
+        if exif_data:
+            # Only visit the handful of tags used below, not every tag in the image
+            for tag_id in _WANTED_TAG_IDS & exif_data.keys():
+                tag = TAGS[tag_id]
+                value = exif_data[tag_id]
+                
+                if tag == "DateTimeOriginal":
+                    try:
+                        result["timestamp"] = datetime.strptime(value, "%Y:%m:%d %H:%M:%S")
+                        result["source"] = "exif"
+                    except (TypeError, ValueError):  # missing or malformed date
+                        pass
+                
+                elif tag == "Make":
+                    result["camera_make"] = str(value).strip()
+                
+                elif tag == "Model":
+                    result["camera_model"] = str(value).strip()
+                        
+                elif tag == "GPSInfo":
+                    if not isinstance(value, Mapping):
+                        continue  # unresolved IFD offset, no GPS data
+                    gps_data = {}
+                    for gps_tag_id, gps_value in value.items():
+                        gps_tag = GPSTAGS.get(gps_tag_id, gps_tag_id)
+                        gps_data[gps_tag] = gps_value
                     
-                    elif tag == "Model":
-                        result["camera_model"] = str(value).strip()
-                            
-                    elif tag == "GPSInfo":
-                        gps_data = {}
-                        for gps_tag_id, gps_value in value.items():
-                            gps_tag = GPSTAGS.get(gps_tag_id, gps_tag_id)
-                            gps_data[gps_tag] = gps_value
+                    if "GPSLatitude" in gps_data and "GPSLongitude" in gps_data:
+                        lat = convert_gps_to_decimal(
+                            gps_data["GPSLatitude"],
+                            gps_data.get("GPSLatitudeRef", "N")
+                        )
+                        lon = convert_gps_to_decimal(
+                            gps_data["GPSLongitude"],
+                            gps_data.get("GPSLongitudeRef", "E")
+                        )
+                        result["gps_lat"] = lat
+                        result["gps_lon"] = lon
                         
-                        if "GPSLatitude" in gps_data and "GPSLongitude" in gps_data:
-                            lat = convert_gps_to_decimal(
-                                gps_data["GPSLatitude"],
-                                gps_data.get("GPSLatitudeRef", "N")
-                            )
-                            lon = convert_gps_to_decimal(
-                                gps_data["GPSLongitude"],
-                                gps_data.get("GPSLongitudeRef", "E")
-                            )
-                            result["gps_lat"] = lat
-                            result["gps_lon"] = lon
-                            
-                            if geolocator and lat and lon:
-                                try:
-                                    location = geolocator.reverse(f"{lat}, {lon}", timeout=5)
-                                    if location:
-                                        result["location_name"] = location.address
-                                except Exception as e:
-                                    print(f"Geocoding failed: {e}")
-                
-                if result["camera_make"]:
-                    result["camera_type"] = f"{result['camera_make']} {result.get('camera_model', '')}".strip()
+                        if geolocator and lat and lon:
+                            try:
+                                result["location_name"] = reverse_geocode(lat, lon)
+                            except Exception as e:
+                                logger.warning("Geocoding failed: %s", e)
+            
+            if result["camera_make"]:
+                result["camera_type"] = f"{result['camera_make']} {result.get('camera_model', '')}".strip()
     
     except Exception as e:
-        print(f"EXIF extraction failed for {image_path}: {e}")
+        logger.warning("EXIF extraction failed for %s: %s", image_path, e)
     
     # Fallback to filename parsing
     if result["timestamp"] is None:
@@ -197,3 +329,38 @@ def extract_metadata(image_path: str) -> Dict[str, Any]:
             result["source"] = "filename"
     
     return result
+
+
+_DATETIME_ORIGINAL = 0x9003
+
+
+def metadata_from_cache(metadata: Dict[str, Any]) -> Dict[str, Any]:
+    """Restore the datetime timestamp of an extract_metadata() result read back from the JSON cache."""
+    if isinstance(metadata.get("timestamp"), str):
+        metadata["timestamp"] = datetime.fromisoformat(metadata["timestamp"])
+    return metadata
+
+
+def get_timestamp_only(image_path: str) -> Optional[datetime]:
+    """
+    Capture time of an image, for callers that don't need GPS or camera info.
+    Reads only DateTimeOriginal from the Exif IFD (no geocoding, no GPS IFD),
+    then falls back to the filename like extract_metadata().
+    """
+    try:
+        segment = read_exif_segment(image_path)
+        if segment:
+            exif = Image.Exif()
+            exif.load(segment)
+            value = exif.get_ifd(_EXIF_IFD).get(_DATETIME_ORIGINAL)
+        elif segment is not None:
+            value = None
+        else:
+            with Image.open(image_path) as img:
+                value = img.getexif().get_ifd(_EXIF_IFD).get(_DATETIME_ORIGINAL)
+        if value:
+            return datetime.strptime(value, "%Y:%m:%d %H:%M:%S")
+    except (OSError, TypeError, ValueError) as e:
+        logger.warning("EXIF timestamp read failed for %s: %s", image_path, e)
+    
+    return parse_filename_timestamp(image_path)["timestamp"]
@@ -0,0 +1,79 @@
+"""
+Normalized forensic child rows.
+Mirrors the ForensicAnalysis JSON arrays (damaged panels, repair breakdown,
+risk flags) into their own tables so they can be filtered and counted in SQL.
+"""
+
+from typing import Any, Dict, List
+
+from sqlalchemy import delete, insert
+from sqlalchemy.orm import Session
+
+from app.db import models
+
+_CHILD_MODELS = (models.DamagedPanel, models.RepairLineItem, models.RiskFlag)
+
+# Keys holding the label when Groq returns an object instead of a plain string
+_LABEL_KEYS = ("panel", "part", "name", "rule_id", "flag")
+
+
+def _unique_labels(values) -> List[str]:
+    """Distinct non-empty labels in order; dict entries use their label key, anything else is skipped."""
+    labels = []
+    for value in values:
+        if isinstance(value, dict):
+            value = next((value[k] for k in _LABEL_KEYS if isinstance(value.get(k), str)), None)
+        if isinstance(value, (str, int, float)) and not isinstance(value, bool):
+            labels.append(str(value))
+    return [label for label in dict.fromkeys(labels) if label]
+
+
+def build_child_rows(claim_id: int, forensic_fields: Dict[str, Any]) -> Dict[Any, List[dict]]:
+    """
+    Build child table rows from mapped forensic fields.
+    
+    Args:
+        claim_id: Claim the rows belong to
+        forensic_fields: ForensicAnalysis column values (as from map_forensic_to_db)
+        
+    Returns:
+        Dict of model class -> list of row dicts
+    """
+    severity = forensic_fields.get("ai_severity")
+    panels = forensic_fields.get("ai_damaged_panels") or forensic_fields.get("ai_affected_parts") or []
+    breakdown = (forensic_fields.get("repair_cost_breakdown") or {}).get("breakdown") or []
+    flags = forensic_fields.get("ai_risk_flags") or []
+    
+    return {
+        models.DamagedPanel: [
+            {"claim_id": claim_id, "panel": panel, "severity": severity}
+            for panel in _unique_labels(panels)
+        ],
+        models.RepairLineItem: [
+            {
+                "claim_id": claim_id,
+                "panel_key": item.get("panel_key"),
+                "part": item.get("part") or item.get("panel_key") or "unknown",
+                "inr_min": item.get("inr_min"),
+                "inr_max": item.get("inr_max"),
+            }
+            for item in breakdown if isinstance(item, dict)
+        ],
+        models.RiskFlag: [
+            {"claim_id": claim_id, "flag": flag}
+            for flag in _unique_labels(flags)
+        ],
+    }
+
+
+def write_forensic_children(db: Session, claim_id: int, forensic_fields: Dict[str, Any]):
+    """
+    Replace a claim's child rows with ones built from forensic_fields.
+    Runs in the caller's transaction; the caller commits.
+    """
+    for model in _CHILD_MODELS:
+        db.execute(delete(model).where(model.claim_id == claim_id))
+    
+    for model, rows in build_child_rows(claim_id, forensic_fields).items():
+        if rows:
+            db.execute(insert(model), rows)
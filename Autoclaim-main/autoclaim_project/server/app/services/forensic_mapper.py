@@ -3,8 +3,81 @@ Helper functions to map AI extracted data to database.
 Works with v3.0 ForensicAnalysis model - Pure extraction + rule-based decisions.
 """
 
+from types import MappingProxyType
 from typing import Dict, Any
 
+# Shared read-only stand-in for a missing/null section, so lookups don't
+# allocate a fresh {} per call and `None` sections don't raise AttributeError
+_EMPTY = MappingProxyType({})
+
+# Values dropped from the mapped fields so the database defaults apply.
+# Module-level: written inline, the tuple (and its list) is rebuilt per field.
+_EMPTY_VALUES = (None, "", [])
+
+# Fields copied straight across by map_forensic_to_db():
+# (ForensicAnalysis column, source, source key, default)
+_FORENSIC_FIELDS = (
+    # EXIF metadata
+    ("exif_timestamp", "metadata", "timestamp", None),
+    ("exif_gps_lat", "metadata", "gps_lat", None),
+    ("exif_gps_lon", "metadata", "gps_lon", None),
+    ("exif_location_name", "metadata", "location_name", None),
+    ("exif_camera_make", "metadata", "camera_make", None),
+    ("exif_camera_model", "metadata", "camera_model", None),
+    # OCR results
+    ("ocr_plate_confidence", "ocr", "confidence", None),
+    ("ocr_raw_texts", "ocr", "raw_texts", []),
+    # YOLO detection
+    ("yolo_damage_detected", "yolo_damage", "damage_detected", False),
+    ("yolo_detections", "yolo_damage", "detections", []),
+    ("yolo_severity", "yolo_damage", "severity", None),
+    ("yolo_summary", "yolo_damage", "summary", None),
+    # Identity extraction
+    ("detected_objects", "identity", "detected_objects", []),
+    ("vehicle_make", "identity", "vehicle_make", None),
+    ("vehicle_model", "identity", "vehicle_model", None),
+    ("vehicle_year", "identity", "vehicle_year", None),
+    ("vehicle_color", "identity", "vehicle_color", None),
+    ("license_plate_obscured", "identity", "license_plate_obscured", False),
+    # Damage extraction
+    ("ai_damage_detected", "damage", "damage_detected", False),
+    ("ai_damage_type", "damage", "damage_type", None),
+    ("impact_point", "damage", "impact_point", None),
+    ("paint_damage", "damage", "paint_damage", False),
+    ("glass_damage", "damage", "glass_damage", False),
+    ("rust_locations", "damage", "rust_locations", []),
+    ("parts_missing", "damage", "parts_missing", False),
+    # Forensics extraction (image integrity)
+    ("has_watermarks", "forensics", "has_watermarks", False),
+    ("is_blurry", "forensics", "is_blurry", False),
+    ("lighting_quality", "forensics", "lighting_quality", None),
+    ("multiple_light_sources", "forensics", "multiple_light_sources", False),
+    ("shadows_inconsistent", "forensics", "shadows_inconsistent", False),
+    # Scene extraction
+    ("location_type", "scene", "location_type", None),
+    ("time_of_day", "scene", "time_of_day", None),
+    ("weather_visible", "scene", "weather_visible", None),
+    ("weather_conditions", "scene", "weather_visible", None),  # Alias
+    ("debris_visible", "scene", "debris_visible", False),
+    ("other_vehicles_visible", "scene", "other_vehicles_visible", False),
+    ("is_moving_traffic", "scene", "is_moving_traffic", False),
+    # Analysis metadata
+    ("ai_provider", "result", "provider", "groq"),
+    ("ai_model", "result", "model", None),
+)
+
+
+# (verification status, requires human review) -> human_review_priority.
+# Other statuses fall back to HIGH when review is required, else MEDIUM.
+_REVIEW_PRIORITY = {
+    ("REJECTED", False): "CRITICAL",
+    ("REJECTED", True): "CRITICAL",
+    ("APPROVED", False): "LOW",
+    ("APPROVED", True): "HIGH",
+    ("FLAGGED", False): "MEDIUM",
+    ("FLAGGED", True): "HIGH",
+}
+
 
 def map_forensic_to_db(ai_result: Dict[str, Any], policy_data: Dict[str, Any] = None) -> Dict[str, Any]:
     """
@@ -25,34 +98,37 @@ def map_forensic_to_db(ai_result: Dict[str, Any], policy_data: Dict[str, Any] =
     
     # Extract sub-sections from Groq extraction
     # Logic updated to handle nested 'ai_analysis' structure from orchestrator
-    ai_analysis_data = ai_result.get("ai_analysis", {})
+    ai_analysis_data = ai_result.get("ai_analysis") or _EMPTY
     
-    identity = ai_analysis_data.get("identity") or ai_result.get("identity", {})
-    damage = ai_analysis_data.get("damage") or ai_result.get("damage", {})
-    forensics = ai_analysis_data.get("forensics") or ai_result.get("forensics", {})
-    scene = ai_analysis_data.get("scene") or ai_result.get("scene", {})
+    identity = ai_analysis_data.get("identity") or ai_result.get("identity") or _EMPTY
+    damage = ai_analysis_data.get("damage") or ai_result.get("damage") or _EMPTY
+    forensics = ai_analysis_data.get("forensics") or ai_result.get("forensics") or _EMPTY
+    scene = ai_analysis_data.get("scene") or ai_result.get("scene") or _EMPTY
     
     # Extract orchest rator sections (metadata, OCR, YOLO)
-    metadata = ai_result.get("metadata", {})
-    ocr = ai_result.get("ocr", {})
-    yolo_damage = ai_result.get("yolo_damage", {})
+    metadata = ai_result.get("metadata") or _EMPTY
+    ocr = ai_result.get("ocr") or _EMPTY
+    yolo_damage = ai_result.get("yolo_damage") or _EMPTY
     
     # Extract computed decisions (from rule-based logic or verification engine)
-    decisions = ai_result.get("decisions", {})
-    verification = ai_result.get("verification", {})
+    decisions = ai_result.get("decisions") or _EMPTY
+    verification = ai_result.get("verification") or _EMPTY
     
     # Use verification results if available (v4.0), otherwise fall back to decisions (v3.0)
-    if verification and not verification.get("error"):
+    verified = bool(verification) and not verification.get("error")
+    if verified:
         # Extract verification data
-        ai_recommendation_value = verification.get("status")  # APPROVED, FLAGGED, REJECTED
-        fraud_probability_value = _map_status_to_fraud_probability(verification.get("status"))
+        status = verification.get("status")  # APPROVED, FLAGGED, REJECTED
+        requires_review = bool(verification.get("requires_human_review"))
+        ai_recommendation_value = status
+        fraud_probability_value = _map_status_to_fraud_probability(status)
         fraud_score_value = verification.get("severity_score", 0.0) / 10.0  # Scale to 0-1
         confidence_score_value = verification.get("confidence_score")
         risk_flags_value = [failure["rule_id"] for failure in verification.get("failed_checks", [])]
         reasoning_value = verification.get("decision_reason")
-        review_priority_value = "CRITICAL" if verification.get("status") == "REJECTED" else \
-                                 "HIGH" if verification.get("requires_human_review") else \
-                                 "LOW" if verification.get("status") == "APPROVED" else "MEDIUM"
+        review_priority_value = _REVIEW_PRIORITY.get(
+            (status, requires_review), "HIGH" if requires_review else "MEDIUM"
+        )
     else:
         # Fall back to legacy decisions format
         ai_recommendation_value = decisions.get("ai_recommendation")
@@ -63,118 +139,82 @@ def map_forensic_to_db(ai_result: Dict[str, Any], policy_data: Dict[str, Any] =
         reasoning_value = decisions.get("ai_reasoning")
         review_priority_value = decisions.get("human_review_priority")
     
-    # Build field mapping
+    # Values used by more than one field, looked up once
+    plate_text = ocr.get("plate_text")
+    severity_score = damage.get("severity_score")
+    airbags_deployed = damage.get("airbags_deployed", False)
+    fluid_leaks_visible = damage.get("fluid_leaks_visible", False)
+    is_rust_present = damage.get("is_rust_present", False)
+    is_dirt_in_damage = damage.get("is_dirt_in_damage", False)
+    is_paint_faded = damage.get("is_paint_faded_around_damage", False)
+    damaged_panels = damage.get("damaged_panels", [])
+    cost_range = damage.get("estimated_cost_range_INR") or _EMPTY
+    is_screen_recapture = forensics.get("is_screen_recapture", False)
+    has_ui_elements = forensics.get("has_ui_elements", False)
+    image_quality = forensics.get("image_quality")
+    license_plate_visible = identity.get("license_plate_visible", False)
+    
+    sources = {
+        "metadata": metadata,
+        "ocr": ocr,
+        "yolo_damage": yolo_damage,
+        "identity": identity,
+        "damage": damage,
+        "forensics": forensics,
+        "scene": scene,
+        "result": ai_result,
+    }
     forensic_data = {
-        # ============================================================
-        # EXIF METADATA
-        # ============================================================
-        "exif_timestamp": metadata.get("timestamp"),
-        "exif_gps_lat": metadata.get("gps_lat"),
-        "exif_gps_lon": metadata.get("gps_lon"),
-        "exif_location_name": metadata.get("location_name"),
-        "exif_camera_make": metadata.get("camera_make"),
-        "exif_camera_model": metadata.get("camera_model"),
-        
-        # ============================================================
-        # OCR RESULTS
-        # ============================================================
-        "ocr_plate_text": ocr.get("plate_text"),
-        "ocr_plate_confidence": ocr.get("confidence"),
-        "ocr_raw_texts": ocr.get("raw_texts", []),
-        
-        # ============================================================
-        # YOLO DETECTION
-        # ============================================================
-        "yolo_damage_detected": yolo_damage.get("damage_detected", False),
-        "yolo_detections": yolo_damage.get("detections", []),
-        "yolo_severity": yolo_damage.get("severity"),
-        "yolo_summary": yolo_damage.get("summary"),
-        
-        # ============================================================
-        # IDENTITY EXTRACTION
-        # ============================================================
-        "detected_objects": identity.get("detected_objects", []),
-        "vehicle_make": identity.get("vehicle_make"),
-        "vehicle_model": identity.get("vehicle_model"),
-        "vehicle_year": identity.get("vehicle_year"),
-        "vehicle_color": identity.get("vehicle_color"),
-        "license_plate_text": identity.get("license_plate_text") or ocr.get("plate_text"),
-        "license_plate_visible": identity.get("license_plate_visible", False),
-        "license_plate_obscured": identity.get("license_plate_obscured", False),
-        "license_plate_detected": identity.get("license_plate_visible", False) or bool(ocr.get("plate_text")),
+        column: sources[source].get(key, default)
+        for column, source, key, default in _FORENSIC_FIELDS
+    }
+    
+    # Derived and cross-source fields
+    forensic_data.update({
+        # OCR / identity
+        "ocr_plate_text": plate_text,
+        "license_plate_text": identity.get("license_plate_text") or plate_text,
+        "license_plate_visible": license_plate_visible,
+        "license_plate_detected": license_plate_visible or bool(plate_text),
         
-        # ============================================================
-        # DAMAGE EXTRACTION
-        # ============================================================
-        "ai_damage_detected": damage.get("damage_detected", False),
-        "ai_damage_type": damage.get("damage_type"),
-        "damage_severity_score": damage.get("severity_score"),
-        "ai_damaged_panels": damage.get("damaged_panels", []),
-        "impact_point": damage.get("impact_point"),
-        "paint_damage": damage.get("paint_damage", False),
-        "glass_damage": damage.get("glass_damage", False),
-        "is_rust_present": damage.get("is_rust_present", False),
-        "rust_locations": damage.get("rust_locations", []),
-        "is_dirt_in_damage": damage.get("is_dirt_in_damage", False),
-        "is_paint_faded_around_damage": damage.get("is_paint_faded_around_damage", False),
-        "airbags_deployed": damage.get("airbags_deployed", False),
-        "fluid_leaks_visible": damage.get("fluid_leaks_visible", False),
-        "parts_missing": damage.get("parts_missing", False),
+        # Damage
+        "damage_severity_score": severity_score,
+        "ai_damaged_panels": damaged_panels,
+        "is_rust_present": is_rust_present,
+        "is_dirt_in_damage": is_dirt_in_damage,
+        "is_paint_faded_around_damage": is_paint_faded,
+        "airbags_deployed": airbags_deployed,
+        "fluid_leaks_visible": fluid_leaks_visible,
         
         # Computed severity label and structural damage flag
-        "ai_severity": _compute_severity_label(damage.get("severity_score")),
-        "ai_affected_parts": damage.get("damaged_panels", []),  # backward compat alias
+        "ai_severity": _compute_severity_label(severity_score),
+        "ai_affected_parts": damaged_panels,  # backward compat alias
         "ai_structural_damage": (
-            damage.get("airbags_deployed", False) or
-            damage.get("fluid_leaks_visible", False) or
-            (damage.get("severity_score") or 0) >= 8
+            airbags_deployed or
+            fluid_leaks_visible or
+            (severity_score or 0) >= 8
         ),
         
         # Cost estimation from AI
-        "ai_cost_min": damage.get("estimated_cost_range_INR", {}).get("min"),
-        "ai_cost_max": damage.get("estimated_cost_range_INR", {}).get("max"),
+        "ai_cost_min": cost_range.get("min"),
+        "ai_cost_max": cost_range.get("max"),
         
-        # ============================================================
-        # FORENSICS EXTRACTION (Image Integrity)
-        # ============================================================
-        "is_screen_recapture": forensics.get("is_screen_recapture", False),
-        "has_ui_elements": forensics.get("has_ui_elements", False),
-        "has_watermarks": forensics.get("has_watermarks", False),
-        "image_quality": forensics.get("image_quality"),
-        "is_blurry": forensics.get("is_blurry", False),
-        "lighting_quality": forensics.get("lighting_quality"),
-        "multiple_light_sources": forensics.get("multiple_light_sources", False),
-        "shadows_inconsistent": forensics.get("shadows_inconsistent", False),
-        
-        "forgery_detected": forensics.get("is_screen_recapture", False) or forensics.get("has_ui_elements", False),
+        # Forensics (image integrity)
+        "is_screen_recapture": is_screen_recapture,
+        "has_ui_elements": has_ui_elements,
+        "image_quality": image_quality,
+        "photo_quality": image_quality,  # Alias
+        "forgery_detected": is_screen_recapture or has_ui_elements,
         "forgery_indicators": _build_forgery_indicators(forensics),
         "authenticity_score": _compute_authenticity_score(forensics),
         
-        # ============================================================
-        # SCENE EXTRACTION
-        # ============================================================
-        "location_type": scene.get("location_type"),
-        "time_of_day": scene.get("time_of_day"),
-        "weather_visible": scene.get("weather_visible"),
-        "weather_conditions": scene.get("weather_visible"),  # Alias
-        "debris_visible": scene.get("debris_visible", False),
-        "other_vehicles_visible": scene.get("other_vehicles_visible", False),
-        "is_moving_traffic": scene.get("is_moving_traffic", False),
-        "photo_quality": forensics.get("image_quality"),  # Alias
-        
-        # ============================================================
-        # PRE-EXISTING DAMAGE (Computed from indicators)
-        # ============================================================
-        "pre_existing_damage_detected": damage.get("is_rust_present", False) or 
-                                        damage.get("is_dirt_in_damage", False) or 
-                                        damage.get("is_paint_faded_around_damage", False),
+        # Pre-existing damage (computed from indicators)
+        "pre_existing_damage_detected": is_rust_present or is_dirt_in_damage or is_paint_faded,
         "pre_existing_indicators": _build_pre_existing_indicators(damage),
         "pre_existing_description": _build_pre_existing_description(damage),
         "pre_existing_confidence": _compute_pre_existing_confidence(damage),
         
-        # ============================================================
-        # RULE-BASED DECISIONS / VERIFICATION RESULTS (Computed)
-        # ============================================================
+        # Rule-based decisions / verification results
         "ai_risk_flags": risk_flags_value,
         "fraud_probability": fraud_probability_value,
         "fraud_score": fraud_score_value,
@@ -183,41 +223,51 @@ def map_forensic_to_db(ai_result: Dict[str, Any], policy_data: Dict[str, Any] =
         "ai_reasoning": reasoning_value,
         "human_review_priority": review_priority_value,
         
-        # ============================================================
-        # METADATA
-        # ============================================================
+        # Metadata
         "ai_raw_response": ai_result,  # Store complete response
-        "ai_provider": ai_result.get("provider", "groq"),
-        "ai_model": ai_result.get("model"),
-        "analysis_version": "4.0" if verification and not verification.get("error") else "3.0",
+        "analysis_version": "4.0" if verified else "3.0",
         
         # License plate match status (compare OCR vs policy)
         "license_plate_match_status": _compute_plate_match(
-            ocr.get("plate_text") or identity.get("license_plate_text"),
+            plate_text or identity.get("license_plate_text"),
             policy_data
         ),
-    }
+    })
     
     # Remove None values and empty strings/lists to use database defaults
-    return {k: v for k, v in forensic_data.items() if v not in (None, "", [])}
+    return {k: v for k, v in forensic_data.items() if v not in _EMPTY_VALUES}
+
+
+# Forensics flag -> forgery indicator label, in output order
+_FORGERY_FLAGS = (
+    ("is_screen_recapture", "SCREEN_RECAPTURE"),
+    ("has_ui_elements", "UI_ELEMENTS"),
+    ("has_watermarks", "WATERMARKS"),
+    ("shadows_inconsistent", "INCONSISTENT_SHADOWS"),
+    ("multiple_light_sources", "MULTIPLE_LIGHT_SOURCES"),
+)
+
+# Damage flag -> pre-existing indicator label (after the RUST entries)
+_PRE_EXISTING_FLAGS = (
+    ("is_dirt_in_damage", "DIRT_IN_DAMAGE"),
+    ("is_paint_faded_around_damage", "FADED_PAINT"),
+)
+
+
+# Forensics flag -> points deducted from the authenticity score
+_AUTHENTICITY_PENALTIES = (
+    ("is_screen_recapture", 30),
+    ("has_ui_elements", 20),
+    ("has_watermarks", 10),
+    ("shadows_inconsistent", 15),
+    ("multiple_light_sources", 10),
+    ("is_blurry", 5),
+)
 
 
 def _build_forgery_indicators(forensics: Dict[str, Any]) -> list:
     """Build list of forgery indicators from extracted forensics data."""
-    indicators = []
-    
-    if forensics.get("is_screen_recapture"):
-        indicators.append("SCREEN_RECAPTURE")
-    if forensics.get("has_ui_elements"):
-        indicators.append("UI_ELEMENTS")
-    if forensics.get("has_watermarks"):
-        indicators.append("WATERMARKS")
-    if forensics.get("shadows_inconsistent"):
-        indicators.append("INCONSISTENT_SHADOWS")
-    if forensics.get("multiple_light_sources"):
-        indicators.append("MULTIPLE_LIGHT_SOURCES")
-    
-    return indicators
+    return [label for flag, label in _FORGERY_FLAGS if forensics.get(flag)]
 
 
 def _build_pre_existing_indicators(damage: Dict[str, Any]) -> list:
@@ -226,45 +276,52 @@ def _build_pre_existing_indicators(damage: Dict[str, Any]) -> list:
     
     if damage.get("is_rust_present"):
         indicators.append("RUST")
-        if damage.get("rust_locations"):
-            indicators.extend([f"RUST_{loc.upper()}" for loc in damage.get("rust_locations", [])])
-    
-    if damage.get("is_dirt_in_damage"):
-        indicators.append("DIRT_IN_DAMAGE")
-    
-    if damage.get("is_paint_faded_around_damage"):
-        indicators.append("FADED_PAINT")
+        indicators.extend(f"RUST_{loc.upper()}" for loc in damage.get("rust_locations") or ())
     
+    indicators.extend(label for flag, label in _PRE_EXISTING_FLAGS if damage.get(flag))
     return indicators
 
 
-def extract_simple_fields(ai_result: Dict[str, Any]) -> Dict[str, Any]:
+def extract_simple_fields(ai_result: Dict[str, Any], forensic_data: Dict[str, Any] = None) -> Dict[str, Any]:
     """
     Extract simplified fields for Claim table (denormalized for quick access).
     
     Args:
         ai_result: Complete analysis result
+        forensic_data: Output of map_forensic_to_db() for the same result, if
+            already built; the fields are then read from it directly
         
     Returns:
         dict with simplified fields for Claim model
     """
-    ocr = ai_result.get("ocr", {})
-    identity = ai_result.get("identity", {})
-    damage = ai_result.get("damage", {})
-    decisions = ai_result.get("decisions", {})
-    verification = ai_result.get("verification", {})
+    if forensic_data is not None:
+        return {
+            "vehicle_number_plate": forensic_data.get("ocr_plate_text") or forensic_data.get("license_plate_text"),
+            "ai_recommendation": forensic_data.get("ai_recommendation"),
+            "estimated_cost_min": forensic_data.get("ai_cost_min"),
+            "estimated_cost_max": forensic_data.get("ai_cost_max")
+        }
+    
+    ocr = ai_result.get("ocr") or _EMPTY
+    identity = ai_result.get("identity") or _EMPTY
+    damage = ai_result.get("damage") or _EMPTY
+    decisions = ai_result.get("decisions") or _EMPTY
+    verification = ai_result.get("verification") or _EMPTY
     
-    # Use verification if available
-    if verification and not verification.get("error"):
+    # Use verification if available (same check as map_forensic_to_db)
+    verified = bool(verification) and not verification.get("error")
+    if verified:
         ai_recommendation = verification.get("status")
     else:
         ai_recommendation = decisions.get("ai_recommendation")
     
+    cost_range = damage.get("estimated_cost_range_INR") or _EMPTY
+    
     return {
         "vehicle_number_plate": ocr.get("plate_text") or identity.get("license_plate_text"),
         "ai_recommendation": ai_recommendation,
-        "estimated_cost_min": damage.get("estimated_cost_range_INR", {}).get("min"),
-        "estimated_cost_max": damage.get("estimated_cost_range_INR", {}).get("max")
+        "estimated_cost_min": cost_range.get("min"),
+        "estimated_cost_max": cost_range.get("max")
     }
 
 
@@ -312,46 +369,42 @@ def _compute_authenticity_score(forensics: Dict[str, Any]) -> float:
     Compute an authenticity score (0-100) from forensic indicators.
     Starts at 100 and deducts points for red flags.
     """
-    score = 100.0
+    deduction = sum(penalty for flag, penalty in _AUTHENTICITY_PENALTIES if forensics.get(flag))
     
-    if forensics.get("is_screen_recapture"):
-        score -= 30
-    if forensics.get("has_ui_elements"):
-        score -= 20
-    if forensics.get("has_watermarks"):
-        score -= 10
-    if forensics.get("shadows_inconsistent"):
-        score -= 15
-    if forensics.get("multiple_light_sources"):
-        score -= 10
-    if forensics.get("is_blurry"):
-        score -= 5
-    if (forensics.get("image_quality") or "").lower() == "low":
-        score -= 10
+    image_quality = forensics.get("image_quality")
+    if image_quality and image_quality.lower() == "low":
+        deduction += 10
     
-    return max(0.0, score)
+    return max(0.0, 100.0 - deduction)
 
 
 def _build_pre_existing_description(damage: Dict[str, Any]) -> str:
     """
     Build a human-readable description of pre-existing damage indicators.
     """
+    rust = damage.get("is_rust_present")
+    dirt = damage.get("is_dirt_in_damage")
+    faded = damage.get("is_paint_faded_around_damage")
+    # Most claims have no pre-existing damage
+    if not (rust or dirt or faded):
+        return None
+    
     parts = []
     
-    if damage.get("is_rust_present"):
+    if rust:
         locs = damage.get("rust_locations", [])
         if locs:
-            parts.append(f"Rust detected on {', '.join(locs)}")
+            parts.append(f"Rust detected on {', '.join(locs)}.")
         else:
-            parts.append("Rust detected on damaged area")
+            parts.append("Rust detected on damaged area.")
     
-    if damage.get("is_dirt_in_damage"):
-        parts.append("Dirt accumulation found inside damaged area, suggesting the damage is not recent")
+    if dirt:
+        parts.append("Dirt accumulation found inside damaged area, suggesting the damage is not recent.")
     
-    if damage.get("is_paint_faded_around_damage"):
-        parts.append("Paint fading observed around the damaged area, indicating prolonged exposure")
+    if faded:
+        parts.append("Paint fading observed around the damaged area, indicating prolonged exposure.")
     
-    return ". ".join(parts) + "." if parts else None
+    return " ".join(parts)
 
 
 def _compute_pre_existing_confidence(damage: Dict[str, Any]) -> float:
@@ -370,6 +423,18 @@ def _compute_pre_existing_confidence(damage: Dict[str, Any]) -> float:
     return {1: 40.0, 2: 70.0, 3: 95.0}[count]
 
 
+# Drops spaces and dashes and uppercases ASCII letters in one translate() pass
+_PLATE_TABLE = {ord(" "): None, ord("-"): None}
+_PLATE_TABLE.update({ord(c): ord(c.upper()) for c in "abcdefghijklmnopqrstuvwxyz"})
+
+
+def _normalize_plate(plate: str) -> str:
+    """Plate text without spaces/dashes, uppercased."""
+    norm = plate.translate(_PLATE_TABLE)
+    # Non-ASCII text (rare OCR output) still needs the full Unicode upper()
+    return norm if norm.isascii() else norm.upper()
+
+
 def _compute_plate_match(detected_plate: str, policy_data: Dict[str, Any] = None) -> str:
     """
     Compare detected plate text against policy vehicle registration.
@@ -381,8 +446,8 @@ def _compute_plate_match(detected_plate: str, policy_data: Dict[str, Any] = None
         return "UNKNOWN"
     
     # Normalize: strip spaces, dashes, uppercase
-    norm_detected = detected_plate.upper().replace(" ", "").replace("-", "")
-    norm_policy = policy_data["vehicle_registration"].upper().replace(" ", "").replace("-", "")
+    norm_detected = _normalize_plate(detected_plate)
+    norm_policy = _normalize_plate(policy_data["vehicle_registration"])
     
     if norm_detected == norm_policy:
         return "MATCH"
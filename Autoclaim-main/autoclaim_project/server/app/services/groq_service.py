@@ -4,12 +4,24 @@ Fast, low-cost, deterministic fact extraction for fraud detection.
 AI extracts facts → Python code makes decisions.
 """
 
+import logging
 import os
-import json
-import base64
 from typing import Dict, Any, List, Optional
+import orjson
 from groq import Groq
 from app.core.config import settings
+from app.services.result_cache import cache_is_shared, get_cached, image_key, set_cached
+
+# pybase64 is a drop-in, SIMD-accelerated replacement for the stdlib module
+try:
+    import pybase64 as base64
+except ImportError:
+    import base64
+
+logger = logging.getLogger(__name__)
+
+# Images sent per request (limit to 2 for speed)
+MAX_IMAGES = 2
 
 # Initialize Groq client
 groq_client = None
@@ -57,15 +69,44 @@ def encode_image_base64(image_path: str) -> Optional[str]:
         # Compress to JPEG quality 80 (good enough for extraction)
         buffer = io.BytesIO()
         img.save(buffer, format='JPEG', quality=80, optimize=True)
-        buffer.seek(0)
         
-        return base64.b64encode(buffer.read()).decode('utf-8')
+        return base64.b64encode(buffer.getvalue()).decode('utf-8')
         
     except Exception as e:
-        print(f"[ERROR] Failed to encode image: {e}")
+        logger.error("[ERROR] Failed to encode image: %s", e)
         return None
 
 
+def precompute_b64_payloads(image_paths: List[str]) -> List[str]:
+    """
+    Encoded (resized JPEG, base64) payloads for the images Groq will receive.
+    Cached by image content hash, so retries and re-analysis skip the
+    decode/resize/encode work. Missing or unreadable images are skipped.
+    Only cached (briefly) in Redis: each payload is a few hundred KB, too much
+    to hold in every process's memory cache.
+    """
+    use_cache = cache_is_shared()
+    payloads = []
+    for path in image_paths:
+        if len(payloads) == MAX_IMAGES:
+            break
+        if not os.path.exists(path):
+            continue
+        
+        if not use_cache:
+            payload = encode_image_base64(path)
+        else:
+            key = f"b64:{image_key(path)}"
+            payload = get_cached(key)
+            if payload is None:
+                payload = encode_image_base64(path)
+                if payload:
+                    set_cached(key, payload, ttl=settings.B64_CACHE_TTL)
+        if payload:
+            payloads.append(payload)
+    return payloads
+
+
 def build_extraction_prompt(description: str, policy_data: Optional[Dict] = None) -> str:
     """
     Lean prompt for pure data extraction.
@@ -147,11 +188,15 @@ RITICAL RULES:
 def extract_vehicle_data(
     image_paths: List[str], 
     description: str = "",
-    policy_data: Dict[str, Any] = None
+    policy_data: Dict[str, Any] = None,
+    image_payloads: Optional[List[str]] = None
 ) -> Dict[str, Any]:
     """
     Fast data extraction from vehicle damage images.
     Returns facts only - no decisions.
+    
+    image_payloads: output of precompute_b64_payloads(image_paths), when the
+    caller has already encoded the images
     """
     if not groq_client:
         init_groq()
@@ -166,19 +211,17 @@ def extract_vehicle_data(
     prompt = build_extraction_prompt(description, policy_data)
     
     # Prepare images (limit to 2 for speed)
-    image_contents = []
-    for path in image_paths[:2]:
-        if not os.path.exists(path):
-            continue
-        
-        base64_image = encode_image_base64(path)
-        if base64_image:
-            image_contents.append({
-                "type": "image_url",
-                "image_url": {
-                    "url": f"data:image/jpeg;base64,{base64_image}"
-                }
-            })
+    if image_payloads is None:
+        image_payloads = precompute_b64_payloads(image_paths)
+    image_contents = [
+        {
+            "type": "image_url",
+            "image_url": {
+                "url": f"data:image/jpeg;base64,{base64_image}"
+            }
+        }
+        for base64_image in image_payloads[:MAX_IMAGES]
+    ]
     
     if not image_contents:
         return {
@@ -196,7 +239,7 @@ def extract_vehicle_data(
     }]
     
     try:
-        print(f"[INFO] Extracting data with Groq ({len(image_contents)} images)...")
+        logger.info("[INFO] Extracting data with Groq (%d images)...", len(image_contents))
         
         # Call Groq API with smaller, faster model if available
         # Try llama-3.2-11b-vision-preview first, fallback to configured model
@@ -214,18 +257,18 @@ def extract_vehicle_data(
         
         # Parse JSON
         try:
-            data = json.loads(response_text)
+            data = orjson.loads(response_text)
             data["success"] = True
             data["provider"] = "groq"
             data["model"] = model
             
-            print(f"[OK] Data extracted successfully")
+            logger.info("[OK] Data extracted successfully")
             
             return data
             
-        except json.JSONDecodeError as e:
-            print(f"[ERROR] JSON parse failed: {e}")
-            print(f"Response: {response_text[:500]}")
+        except orjson.JSONDecodeError as e:
+            logger.error("[ERROR] JSON parse failed: %s", e)
+            logger.error("Response: %.500s", response_text)
             return {
                 "error": "Invalid JSON response",
                 "raw_response": response_text,
@@ -233,10 +276,10 @@ def extract_vehicle_data(
             }
     
     except Exception as e:
-        print(f"[ERROR] Groq API call failed: {e}")
+        logger.error("[ERROR] Groq API call failed: %s", e)
         # Fallback to configured model
         if "llama-3.2-11b-vision-preview" in str(e):
-            print("[INFO] Falling back to configured model...")
+            logger.info("[INFO] Falling back to configured model...")
             try:
                 response = groq_client.chat.completions.create(
                     model=settings.GROQ_MODEL,
@@ -245,13 +288,13 @@ def extract_vehicle_data(
                     max_tokens=1500,
                     response_format={"type": "json_object"}
                 )
-                data = json.loads(response.choices[0].message.content)
+                data = orjson.loads(response.choices[0].message.content)
                 data["success"] = True
                 data["provider"] = "groq"
                 data["model"] = settings.GROQ_MODEL
                 return data
             except Exception as e2:
-                print(f"[ERROR] Fallback also failed: {e2}")
+                logger.error("[ERROR] Fallback also failed: %s", e2)
                 return {"error": str(e2), "success": False}
         
         return {
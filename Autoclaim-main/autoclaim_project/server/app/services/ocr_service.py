@@ -3,6 +3,7 @@ OCR Service for Number Plate Extraction.
 Uses EasyOCR to extract vehicle registration numbers.
 """
 
+import logging
 from typing import Dict, Any
 
 # Try to import EasyOCR
@@ -13,6 +14,8 @@ except ImportError:
     OCR_AVAILABLE = False
     print("Warning: EasyOCR not installed")
 
+logger = logging.getLogger(__name__)
+
 # OCR Reader instance
 ocr_reader = None
 
@@ -76,6 +79,6 @@ def extract_number_plate(image_path: str) -> Dict[str, Any]:
             result["confidence"] = round(best_confidence, 3)
             
     except Exception as e:
-        print(f"OCR failed for {image_path}: {e}")
+        logger.warning("OCR failed for %s: %s", image_path, e)
     
     return result
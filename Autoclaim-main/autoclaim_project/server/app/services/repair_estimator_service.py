@@ -7,8 +7,11 @@ No external API needed - uses a curated part price table based on
 US automotive repair industry averages.
 """
 
+import logging
 from typing import Dict, Any, List, Optional
 
+logger = logging.getLogger(__name__)
+
 # USD to INR conversion rate (update periodically)
 USD_TO_INR = 84.0
 
@@ -348,9 +351,12 @@ def estimate_repair_cost(
     total_inr_min = round(total_usd_min * usd_to_inr)
     total_inr_max = round(total_usd_max * usd_to_inr)
 
-    print(f"[RepairEstimator] {len(breakdown)} parts priced: "
-          f"${total_usd_min}–${total_usd_max} USD → "
-          f"₹{total_inr_min:,}–₹{total_inr_max:,} INR")
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(
+            "[RepairEstimator] %d parts priced: $%s–$%s USD → ₹%s–₹%s INR",
+            len(breakdown), total_usd_min, total_usd_max,
+            f"{total_inr_min:,}", f"{total_inr_max:,}"
+        )
 
     return {
         "breakdown": breakdown,
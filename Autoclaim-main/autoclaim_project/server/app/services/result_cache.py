@@ -0,0 +1,169 @@
+"""
+Cache for per-image AI results (EXIF, OCR, YOLO) and Groq extractions.
+Results are pure functions of the image bytes, so they are keyed by a
+content hash and survive retries, re-analysis and duplicate uploads.
+
+Uses Redis when REDIS_URL is set (shared across workers), otherwise an
+in-process TTL cache.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+from typing import Any, Callable, Dict, Iterable, Optional
+
+import orjson
+from cachetools import TLRUCache
+
+from app.core.config import settings
+
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryCache:
+    """In-process cache with per-entry TTLs and the subset of the Redis API used here."""
+
+    def __init__(self, maxsize: int = 4096):
+        # Values are stored as (ttl, value) so each entry expires on its own TTL
+        self._data = TLRUCache(maxsize=maxsize, ttu=lambda key, entry, now: now + entry[0])
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._data.get(key)
+        return entry[1] if entry is not None else None
+
+    def setex(self, key: str, ttl: int, value: bytes) -> None:
+        with self._lock:
+            self._data[key] = (ttl, value)
+
+
+class RedisCache:
+    """Thin wrapper so Redis errors degrade to cache misses instead of failing the analysis."""
+
+    def __init__(self, url: str):
+        self._client = redis.Redis.from_url(url, socket_timeout=0.5)
+
+    def get(self, key: str) -> Optional[bytes]:
+        try:
+            return self._client.get(key)
+        except redis.RedisError as e:
+            logger.warning("[Cache] Redis get failed: %s", e)
+            return None
+
+    def setex(self, key: str, ttl: int, value: bytes) -> None:
+        try:
+            self._client.setex(key, ttl, value)
+        except redis.RedisError as e:
+            logger.warning("[Cache] Redis set failed: %s", e)
+
+
+_cache = None
+
+
+def get_cache():
+    """Return the process-wide cache, creating it on first use."""
+    global _cache
+    if _cache is None:
+        if settings.REDIS_URL and REDIS_AVAILABLE:
+            _cache = RedisCache(settings.REDIS_URL)
+        else:
+            if settings.REDIS_URL:
+                print("[WARNING] REDIS_URL set but redis is not installed. Run: pip install redis")
+            _cache = MemoryCache()
+    return _cache
+
+
+def cache_is_shared() -> bool:
+    """True when the cache is Redis (shared across processes) rather than in-process memory."""
+    return isinstance(get_cache(), RedisCache)
+
+
+def set_cache(cache) -> None:
+    """Swap the cache backend (e.g. a MemoryCache in tests)."""
+    global _cache
+    _cache = cache
+
+
+def image_key(path: str) -> str:
+    """Short content hash of an image file (blake2b, not for security)."""
+    h = hashlib.blake2b(digest_size=8)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def combined_key(parts: Iterable[Any]) -> str:
+    """Short hash over several values (image keys, description, ...)."""
+    h = hashlib.blake2b(digest_size=8)
+    for part in parts:
+        h.update(repr(part).encode())
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+# numpy scalars/arrays show up in YOLO and OCR results
+_DUMPS_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def get_cached(key: str) -> Optional[Any]:
+    """Cached value for key, or None on a miss."""
+    raw = get_cache().get(key)
+    if raw is None:
+        return None
+    try:
+        return orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        # Entry from an older (non-JSON) format: treat as a miss
+        return None
+
+
+def set_cached(key: str, value: Any, ttl: Optional[int] = None) -> None:
+    # JSON only - anyone who can write to Redis must not get code execution on load
+    try:
+        raw = orjson.dumps(value, option=_DUMPS_OPTIONS)
+    except TypeError as e:
+        logger.warning("[Cache] Not caching %s: %s", key, e)
+        return
+    get_cache().setex(key, ttl or settings.AI_CACHE_TTL, raw)
+
+
+def cached_image_stage(
+    prefix: str,
+    path: str,
+    func: Callable[[str], Dict[str, Any]],
+    include_name: bool = False,
+    should_cache: Optional[Callable[[Dict[str, Any]], bool]] = None,
+    from_cache: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None
+) -> Dict[str, Any]:
+    """
+    Run func(path) through the cache.
+    
+    Args:
+        prefix: Stage name used in the key ("exif", "ocr", "yolo")
+        path: Image path
+        func: Stage function taking the path
+        include_name: Also key on the filename (EXIF falls back to parsing it)
+        should_cache: Predicate deciding whether a result is stored; by default
+            results with success=False are skipped, since those are usually transient
+        from_cache: Converts a cached (JSON) value back to func's return types,
+            e.g. ISO timestamp strings to datetimes
+    """
+    key = f"{prefix}:{image_key(path)}"
+    if include_name:
+        key += f":{os.path.basename(path)}"
+    cached = get_cached(key)
+    if cached is not None:
+        return from_cache(cached) if from_cache else cached
+    value = func(path)
+    if should_cache(value) if should_cache else value.get("success", True):
+        set_cached(key, value)
+    return value
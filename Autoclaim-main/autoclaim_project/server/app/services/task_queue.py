@@ -0,0 +1,120 @@
+"""
+Celery queue for claim AI analysis.
+Used when CELERY_BROKER_URL is set (e.g. redis://localhost:6379/0) and celery
+is installed; otherwise claims are analyzed in-process with FastAPI
+BackgroundTasks as before.
+
+Tasks are acknowledged only after they finish (acks_late), so a worker crash
+puts the claim back on the queue, and failures are retried with backoff.
+
+Start a worker on the AI queue:
+    celery -A app.services.task_queue worker -Q ai_analysis --autoscale=8,2
+"""
+
+import logging
+from typing import List, Optional
+
+from fastapi import BackgroundTasks
+
+from app.core.config import settings
+from app.services.background_tasks import process_claim_ai_analysis, process_claim_reanalysis
+
+try:
+    from celery import Celery
+    from celery.signals import worker_process_init
+    CELERY_AVAILABLE = True
+except ImportError:
+    CELERY_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+AI_QUEUE = "ai_analysis"
+
+CELERY_ENABLED = bool(settings.CELERY_BROKER_URL) and CELERY_AVAILABLE
+if settings.CELERY_BROKER_URL and not CELERY_AVAILABLE:
+    print("[WARNING] CELERY_BROKER_URL set but celery is not installed. Run: pip install celery[redis]")
+
+
+if CELERY_AVAILABLE:
+    celery_app = Celery("autoclaim", broker=settings.CELERY_BROKER_URL or None)
+    celery_app.conf.update(
+        # JSON only - never unpickle broker messages
+        task_serializer="json",
+        accept_content=["json"],
+        result_serializer="json",
+        task_ignore_result=True,
+        # Analysis takes seconds; don't let one worker reserve a backlog
+        worker_prefetch_multiplier=1,
+        task_acks_late=True,
+        task_reject_on_worker_lost=True,
+        task_routes={"autoclaim.analyze_claim": {"queue": AI_QUEUE},
+                     "autoclaim.reanalyze_claim": {"queue": AI_QUEUE}},
+    )
+
+    @worker_process_init.connect
+    def _init_worker(**kwargs):
+        """Load the AI models once per worker process."""
+        from app.services import ai_orchestrator
+        ai_orchestrator.initialize_services()
+
+    @celery_app.task(
+        name="autoclaim.analyze_claim",
+        bind=True,
+        acks_late=True,
+        autoretry_for=(Exception,),
+        retry_backoff=True,
+        max_retries=3
+    )
+    def analyze_claim_task(
+        self,
+        claim_id: int,
+        damage_image_paths: List[str],
+        front_image_path: Optional[str],
+        description: str
+    ):
+        process_claim_ai_analysis(
+            claim_id=claim_id,
+            damage_image_paths=damage_image_paths,
+            front_image_path=front_image_path,
+            description=description,
+            reraise=True
+        )
+
+    @celery_app.task(
+        name="autoclaim.reanalyze_claim",
+        bind=True,
+        acks_late=True,
+        autoretry_for=(Exception,),
+        retry_backoff=True,
+        max_retries=3
+    )
+    def reanalyze_claim_task(self, claim_id: int):
+        process_claim_reanalysis(claim_id, reraise=True)
+
+
+def enqueue_claim_analysis(
+    background_tasks: BackgroundTasks,
+    claim_id: int,
+    damage_image_paths: List[str],
+    front_image_path: Optional[str],
+    description: str
+) -> None:
+    """Queue AI analysis for a new claim on Celery, or as an in-process background task."""
+    kwargs = {
+        "claim_id": claim_id,
+        "damage_image_paths": damage_image_paths,
+        "front_image_path": front_image_path,
+        "description": description,
+    }
+    if CELERY_ENABLED:
+        analyze_claim_task.apply_async(kwargs=kwargs)
+    else:
+        background_tasks.add_task(process_claim_ai_analysis, **kwargs)
+
+
+def enqueue_claim_reanalysis(background_tasks: BackgroundTasks, claim_id: int) -> None:
+    """Queue an admin re-analysis on Celery, or as an in-process background task."""
+    if CELERY_ENABLED:
+        reanalyze_claim_task.apply_async(kwargs={"claim_id": claim_id})
+    else:
+        background_tasks.add_task(process_claim_reanalysis, claim_id)
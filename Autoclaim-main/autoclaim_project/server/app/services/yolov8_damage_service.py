@@ -2,10 +2,16 @@
 Self-hosted YOLOv8 service for vehicle damage detection.
 Runs locally with GPU acceleration - no API costs.
 """
+import itertools
+import multiprocessing
 import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from typing import Dict, Any, List, Optional
 from pathlib import Path
 
+from app.core.config import settings
+
 # Check for ultralytics availability
 try:
     from ultralytics import YOLO
@@ -18,6 +24,7 @@ except ImportError:
 # Global model instance (loaded once on startup)
 damage_model = None
 MODEL_INITIALIZED = False
+MODEL_BACKEND = None  # "tensorrt-int8", "onnxruntime-cpu" or "pytorch-fp32"
 
 
 def check_gpu_available() -> Dict[str, Any]:
@@ -54,7 +61,7 @@ def init_yolo_model(model_name: str = "yolov8n.pt") -> bool:
     Returns:
         bool: Success status
     """
-    global damage_model, MODEL_INITIALIZED
+    global damage_model, MODEL_INITIALIZED, MODEL_BACKEND
     
     if not YOLO_AVAILABLE:
         print("[ERROR] Cannot initialize YOLO - ultralytics not installed")
@@ -69,23 +76,34 @@ def init_yolo_model(model_name: str = "yolov8n.pt") -> bool:
         gpu_info = check_gpu_available()
         print(f"[INFO] GPU Status: {gpu_info}")
         
-        # Try to download specialized car damage model from Hugging Face
-        try:
-            from huggingface_hub import hf_hub_download
-            
-            print("[INFO] Downloading specialized car damage model from Hugging Face...")
-            model_path = hf_hub_download(
-                repo_id="nezahatkorkmaz/car-damage-level-detection-yolov8",
-                filename="best.pt",
-                cache_dir="./models"
-            )
-            damage_model = YOLO(model_path)
-            print(f"[OK] YOLOv8 car damage model loaded: {model_path}")
-        except Exception as e:
-            print(f"[WARNING] Could not load specialized model: {e}")
-            print("[INFO] Falling back to base YOLOv8 model...")
-            damage_model = YOLO(model_name)
-            print(f"[OK] Base YOLOv8 model loaded: {model_name}")
+        # Prefer the prebuilt TensorRT INT8 engine (GPU only, already bound to the device)
+        engine_path = settings.YOLO_ENGINE_PATH
+        if gpu_info["available"] and engine_path and os.path.exists(engine_path):
+            try:
+                damage_model = YOLO(engine_path, task="detect")
+                MODEL_BACKEND = "tensorrt-int8"
+                print(f"[OK] YOLOv8 TensorRT engine loaded: {engine_path}")
+                MODEL_INITIALIZED = True
+                return True
+            except Exception as e:
+                print(f"[WARNING] Could not load TensorRT engine: {e}")
+                print("[INFO] Falling back to PyTorch weights...")
+        
+        # On CPU, ONNX Runtime is several times faster than PyTorch for the same weights
+        onnx_path = settings.YOLO_ONNX_PATH
+        if not gpu_info["available"] and onnx_path and os.path.exists(onnx_path):
+            try:
+                damage_model = YOLO(onnx_path, task="detect")
+                MODEL_BACKEND = "onnxruntime-cpu"
+                print(f"[OK] YOLOv8 ONNX model loaded: {onnx_path}")
+                MODEL_INITIALIZED = True
+                return True
+            except Exception as e:
+                print(f"[WARNING] Could not load ONNX model: {e}")
+                print("[INFO] Falling back to PyTorch weights...")
+        
+        damage_model = YOLO(resolve_damage_weights(model_name))
+        MODEL_BACKEND = "pytorch-fp32"
         
         # Set device (GPU if available, else CPU)
         if gpu_info["available"]:
@@ -104,6 +122,29 @@ def init_yolo_model(model_name: str = "yolov8n.pt") -> bool:
         return False
 
 
+def resolve_damage_weights(model_name: str = "yolov8n.pt") -> str:
+    """
+    Path to the PyTorch weights: the specialized car damage model from
+    Hugging Face, or the base model if it cannot be downloaded.
+    """
+    try:
+        from huggingface_hub import hf_hub_download
+        
+        print("[INFO] Downloading specialized car damage model from Hugging Face...")
+        model_path = hf_hub_download(
+            repo_id="nezahatkorkmaz/car-damage-level-detection-yolov8",
+            filename="best.pt",
+            cache_dir="./models"
+        )
+        print(f"[OK] YOLOv8 car damage weights: {model_path}")
+        return model_path
+    except Exception as e:
+        print(f"[WARNING] Could not load specialized model: {e}")
+        print("[INFO] Falling back to base YOLOv8 model...")
+        print(f"[OK] Using base YOLOv8 weights: {model_name}")
+        return model_name
+
+
 def detect_vehicle_damage(image_path: str, conf_threshold: float = 0.25) -> Dict[str, Any]:
     """
     Detect vehicle damage using self-hosted YOLOv8.
@@ -136,44 +177,7 @@ def detect_vehicle_damage(image_path: str, conf_threshold: float = 0.25) -> Dict
     try:
         # Run inference
         results = damage_model(image_path, conf=conf_threshold, verbose=False)
-        
-        # Extract detections
-        detections = []
-        for result in results:
-            boxes = result.boxes
-            if boxes is not None and len(boxes) > 0:
-                for box in boxes:
-                    class_id = int(box.cls[0])
-                    class_name = result.names[class_id] if class_id in result.names else "unknown"
-                    confidence = float(box.conf[0])
-                    bbox = box.xyxy[0].tolist()  # [x1, y1, x2, y2]
-                    
-                    # Calculate area percentage
-                    area_pct = calculate_area_percentage(bbox, result.orig_shape)
-                    
-                    detection = {
-                        "class_name": class_name,
-                        "class_id": class_id,
-                        "confidence": confidence,
-                        "bbox": bbox,
-                        "area_percentage": area_pct
-                    }
-                    detections.append(detection)
-        
-        # Determine overall severity and affected parts
-        severity = determine_severity(detections)
-        affected_parts = extract_affected_parts(detections)
-        
-        return {
-            "success": True,
-            "vehicle_detected": True,
-            "damage_detected": len(detections) > 0,
-            "detections": detections,
-            "total_detections": len(detections),
-            "severity": severity,
-            "affected_parts": affected_parts,
-            "summary": generate_summary(detections, severity)
-        }
+        return _build_detection_result(results)
         
     except Exception as e:
         return {
@@ -182,6 +186,177 @@ def detect_vehicle_damage(image_path: str, conf_threshold: float = 0.25) -> Dict
         }
 
 
+def detect_vehicle_damage_batch(image_paths: List[str], conf_threshold: float = 0.25) -> List[Dict[str, Any]]:
+    """
+    Detect vehicle damage on several images in a single batched forward pass.
+    
+    Args:
+        image_paths: Paths to the damage images
+        conf_threshold: Confidence threshold (0.0 to 1.0)
+        
+    Returns:
+        list with one detect_vehicle_damage()-style dict per input path, in order
+    """
+    if not YOLO_AVAILABLE:
+        return [{"success": False, "error": "YOLOv8 not available - install ultralytics"} for _ in image_paths]
+    
+    if _worker_pool is not None:
+        return _worker_pool.detect_batch(image_paths, conf_threshold)
+    
+    if damage_model is None:
+        return [
+            {"success": False, "error": "YOLOv8 model not initialized - call init_yolo_model() first"}
+            for _ in image_paths
+        ]
+    
+    outputs: List[Optional[Dict[str, Any]]] = [None] * len(image_paths)
+    batch_paths = []
+    batch_index = []
+    for i, path in enumerate(image_paths):
+        if os.path.exists(path):
+            batch_paths.append(path)
+            batch_index.append(i)
+        else:
+            outputs[i] = {"success": False, "error": f"Image not found: {path}"}
+    
+    if batch_paths:
+        try:
+            # One result per source image, in input order; predict() defaults to
+            # batch=1, so the batch size has to be passed explicitly
+            results = damage_model(
+                batch_paths,
+                conf=conf_threshold,
+                imgsz=640,
+                batch=min(len(batch_paths), settings.YOLO_MAX_BATCH),
+                verbose=False
+            )
+            for i, result in zip(batch_index, results):
+                outputs[i] = _build_detection_result([result])
+        except Exception as e:
+            for i in batch_index:
+                outputs[i] = {"success": False, "error": f"Detection failed: {str(e)}"}
+    
+    return outputs
+
+
+class YoloWorkerPool:
+    """
+    One worker process per GPU, each holding its own YOLOv8 model.
+    
+    Threads in one process contend on the GIL and a single CUDA context, so
+    concurrent claims end up waiting for each other's inference. Each worker
+    sees only its own GPU (CUDA_VISIBLE_DEVICES) and loads the model once;
+    batches are handed out round-robin.
+    """
+    
+    def __init__(self, num_workers: int):
+        ctx = multiprocessing.get_context("spawn")  # CUDA can't be forked
+        self._executors = [
+            ProcessPoolExecutor(
+                max_workers=1,
+                mp_context=ctx,
+                initializer=_init_pool_worker,
+                initargs=(str(gpu),)
+            )
+            for gpu in range(num_workers)
+        ]
+        self._next = itertools.cycle(self._executors)
+        self._lock = threading.Lock()
+    
+    def detect_batch(self, image_paths: List[str], conf_threshold: float = 0.25) -> List[Dict[str, Any]]:
+        """Run detect_vehicle_damage_batch() on the next worker and wait for the result."""
+        with self._lock:
+            executor = next(self._next)
+        try:
+            return executor.submit(detect_vehicle_damage_batch, image_paths, conf_threshold).result()
+        except Exception as e:
+            return [{"success": False, "error": f"YOLO worker failed: {str(e)}"} for _ in image_paths]
+    
+    def shutdown(self) -> None:
+        for executor in self._executors:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+_worker_pool: Optional[YoloWorkerPool] = None
+
+
+def _init_pool_worker(gpu: str) -> None:
+    """Worker process setup: pin to one GPU, single-threaded torch, load the model."""
+    os.environ["CUDA_VISIBLE_DEVICES"] = gpu
+    torch.set_num_threads(1)
+    init_yolo_model()
+
+
+def start_worker_pool() -> bool:
+    """
+    Start one YOLO worker process per GPU (YOLO_WORKER_PROCESSES=1).
+    Returns False, leaving inference in-process, when disabled or no GPU is present.
+    """
+    global _worker_pool
+    if _worker_pool is not None:
+        return True
+    if not YOLO_AVAILABLE or os.getenv("YOLO_WORKER_PROCESSES", "0") != "1":
+        return False
+    
+    num_gpus = torch.cuda.device_count()
+    if num_gpus == 0:
+        print("[INFO] YOLO worker processes need a GPU - using in-process inference")
+        return False
+    
+    _worker_pool = YoloWorkerPool(num_gpus)
+    print(f"[OK] Started {num_gpus} YOLO worker process(es)")
+    return True
+
+
+def stop_worker_pool() -> None:
+    """Stop the YOLO worker processes, if running."""
+    global _worker_pool
+    if _worker_pool is not None:
+        _worker_pool.shutdown()
+        _worker_pool = None
+
+
+def _build_detection_result(results) -> Dict[str, Any]:
+    """Turn ultralytics results for one image into the service's result dict."""
+    # Extract detections
+    detections = []
+    for result in results:
+        boxes = result.boxes
+        if boxes is not None and len(boxes) > 0:
+            for box in boxes:
+                class_id = int(box.cls[0])
+                class_name = result.names[class_id] if class_id in result.names else "unknown"
+                confidence = float(box.conf[0])
+                bbox = box.xyxy[0].tolist()  # [x1, y1, x2, y2]
+                
+                # Calculate area percentage
+                area_pct = calculate_area_percentage(bbox, result.orig_shape)
+                
+                detection = {
+                    "class_name": class_name,
+                    "class_id": class_id,
+                    "confidence": confidence,
+                    "bbox": bbox,
+                    "area_percentage": area_pct
+                }
+                detections.append(detection)
+    
+    # Determine overall severity and affected parts
+    severity = determine_severity(detections)
+    affected_parts = extract_affected_parts(detections)
+    
+    return {
+        "success": True,
+        "vehicle_detected": True,
+        "damage_detected": len(detections) > 0,
+        "detections": detections,
+        "total_detections": len(detections),
+        "severity": severity,
+        "affected_parts": affected_parts,
+        "summary": generate_summary(detections, severity)
+    }
+
+
 def calculate_area_percentage(bbox: List[float], image_shape: tuple) -> float:
     """Calculate percentage of image covered by bounding box."""
     x1, y1, x2, y2 = bbox
@@ -264,5 +439,7 @@ def get_model_info() -> Dict[str, Any]:
         "yolo_available": YOLO_AVAILABLE,
         "model_initialized": MODEL_INITIALIZED,
         "gpu_info": gpu_info,
+        "backend": MODEL_BACKEND,
+        "worker_processes": len(_worker_pool._executors) if _worker_pool else 0,
         "model_type": str(type(damage_model).__name__) if damage_model else None
     }
@@ -0,0 +1,55 @@
+"""
+Backfill the normalized forensic tables (damaged_panels, repair_line_items,
+risk_flags) from the existing ForensicAnalysis JSON columns.
+Safe to re-run: each claim's child rows are replaced.
+"""
+
+from sqlalchemy import select
+
+from app.bootstrap import create_tables
+from app.db.database import SessionLocal
+from app.db import models
+from app.services.forensic_children import write_forensic_children
+
+BATCH_SIZE = 500
+
+
+def backfill():
+    """Rebuild child rows for every analyzed claim."""
+    create_tables()  # make sure the child tables exist
+    
+    fa = models.ForensicAnalysis
+    db = SessionLocal()
+    try:
+        rows = db.execute(
+            select(
+                fa.claim_id,
+                fa.ai_severity,
+                fa.ai_damaged_panels,
+                fa.ai_affected_parts,
+                fa.repair_cost_breakdown,
+                fa.ai_risk_flags
+            ).order_by(fa.claim_id)
+        ).mappings().all()
+        
+        for i, row in enumerate(rows, 1):
+            write_forensic_children(db, row["claim_id"], row)
+            if i % BATCH_SIZE == 0:
+                db.commit()
+                print(f"   ✓ {i}/{len(rows)} claims")
+        
+        db.commit()
+        print(f"\n✅ Backfilled child rows for {len(rows)} claims")
+    except Exception as e:
+        db.rollback()
+        print(f"\n❌ Backfill failed: {e}")
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    print("=" * 50)
+    print("Backfill: Normalized Forensic Tables")
+    print("=" * 50)
+    backfill()
@@ -0,0 +1,100 @@
+"""
+One-time export of the YOLOv8 damage model to a TensorRT INT8 engine.
+Calibrates on the representative damage images in calib/ and writes the
+engine to YOLO_ENGINE_PATH, which init_yolo_model() loads on startup.
+
+Needs an NVIDIA GPU with TensorRT installed. Rebuild the engine whenever
+the GPU, TensorRT version, model weights or YOLO_MAX_BATCH change (the
+engine accepts dynamic batches up to YOLO_MAX_BATCH images).
+
+For CPU-only hosts run `python export_yolo_engine.py onnx` instead; it
+writes an ONNX model to YOLO_ONNX_PATH for ONNX Runtime (needs onnx and
+onnxruntime).
+"""
+
+import os
+import shutil
+import sys
+from pathlib import Path
+
+from app.core.config import settings, BASE_DIR
+from app.services.yolov8_damage_service import resolve_damage_weights
+
+CALIB_DIR = BASE_DIR / "calib"
+
+
+def write_calibration_yaml() -> Path:
+    """Dataset yaml pointing the INT8 calibrator at calib/ (~200 images)."""
+    images = [p for p in CALIB_DIR.glob("*") if p.suffix.lower() in (".jpg", ".jpeg", ".png")]
+    if not images:
+        raise SystemExit(f"❌ No calibration images in {CALIB_DIR}")
+    print(f"✓ {len(images)} calibration images")
+
+    yaml_path = CALIB_DIR / "calib.yaml"
+    yaml_path.write_text(
+        f"path: {CALIB_DIR}\n"
+        "train: .\n"
+        "val: .\n"
+        "names:\n"
+        "  0: damage\n"
+    )
+    return yaml_path
+
+
+def export_engine():
+    """Export the damage model and move the engine to YOLO_ENGINE_PATH."""
+    from ultralytics import YOLO
+
+    weights = resolve_damage_weights()
+    data_yaml = write_calibration_yaml()
+
+    model = YOLO(weights)
+    # Dynamic batch axis so batched damage-image predicts aren't rejected
+    exported = model.export(
+        format="engine",
+        int8=True,
+        imgsz=640,
+        data=str(data_yaml),
+        dynamic=True,
+        batch=settings.YOLO_MAX_BATCH,
+        device=0
+    )
+    print(f"✓ Engine built: {exported} (max batch {settings.YOLO_MAX_BATCH})")
+
+    target = Path(settings.YOLO_ENGINE_PATH)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    shutil.move(str(exported), target)
+    print(f"\n✅ TensorRT engine saved to {target}")
+
+
+def export_onnx():
+    """Export the damage model to ONNX and move it to YOLO_ONNX_PATH."""
+    from ultralytics import YOLO
+
+    model = YOLO(resolve_damage_weights())
+    # Dynamic batch axis to match the batched predict path
+    exported = model.export(format="onnx", imgsz=640, simplify=True, dynamic=True)
+    print(f"✓ ONNX model built: {exported}")
+
+    target = Path(settings.YOLO_ONNX_PATH)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    shutil.move(str(exported), target)
+    print(f"\n✅ ONNX model saved to {target}")
+
+
+if __name__ == "__main__":
+    onnx = len(sys.argv) > 1 and sys.argv[1] == "onnx"
+    target = settings.YOLO_ONNX_PATH if onnx else settings.YOLO_ENGINE_PATH
+
+    print("=" * 50)
+    print("YOLOv8 Export: " + ("ONNX (CPU)" if onnx else "TensorRT INT8 Engine"))
+    print("=" * 50)
+    print(f"Target: {target}\n")
+
+    if os.path.exists(target):
+        print("⚠ Existing model will be replaced")
+
+    if onnx:
+        export_onnx()
+    else:
+        export_engine()
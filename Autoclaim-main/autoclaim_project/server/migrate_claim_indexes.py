@@ -0,0 +1,28 @@
+"""
+Database migration script to add the claim and policy indexes.
+Creates any index declared on the claims and policies models
+(e.g. ix_claim_user_created, ix_policy_user_status) that an
+existing database is missing.
+"""
+
+from app.db.database import engine
+from app.db import models
+
+
+def migrate_database():
+    """Create the claim/policy indexes if they don't exist yet."""
+    for model in (models.Claim, models.Policy):
+        for index in model.__table__.indexes:
+            index.create(bind=engine, checkfirst=True)
+            print(f"✓ {index.name}")
+    
+    print("\n✅ Database migration completed successfully!")
+
+
+if __name__ == "__main__":
+    print("=" * 50)
+    print("Database Migration: Claim & Policy Indexes")
+    print("=" * 50)
+    print(f"Database: {engine.url}\n")
+    
+    migrate_database()
@@ -0,0 +1,53 @@
+"""
+Database migration script for the JSONB forensic columns.
+forensic_analyses.repair_cost_breakdown is declared as JSONB on PostgreSQL.
+Tables created before that change still store it as json (text), so the
+column is converted in place.
+
+SQLite has no JSONB type; nothing to do there.
+"""
+
+from sqlalchemy import inspect
+from sqlalchemy.dialects.postgresql import JSONB
+
+from app.db.database import engine
+from app.db import models
+
+JSONB_COLUMNS = {
+    models.ForensicAnalysis: ("repair_cost_breakdown",),
+}
+
+
+def migrate_database():
+    """ALTER the listed columns to JSONB where they are still json."""
+    if engine.dialect.name != "postgresql":
+        print(f"✓ {engine.dialect.name}: JSONB not supported, nothing to migrate")
+        return
+
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for model, columns in JSONB_COLUMNS.items():
+            table_name = model.__tablename__
+            if not inspector.has_table(table_name):
+                continue
+            types = {col["name"]: col["type"] for col in inspector.get_columns(table_name)}
+            for column in columns:
+                if column not in types or isinstance(types[column], JSONB):
+                    print(f"✓ {table_name}.{column} already JSONB")
+                    continue
+                conn.exec_driver_sql(
+                    f'ALTER TABLE "{table_name}" ALTER COLUMN "{column}" '
+                    f'TYPE JSONB USING "{column}"::jsonb'
+                )
+                print(f"✓ {table_name}.{column} -> JSONB")
+
+    print("\n✅ Database migration completed successfully!")
+
+
+if __name__ == "__main__":
+    print("=" * 50)
+    print("Database Migration: JSONB Forensic Columns")
+    print("=" * 50)
+    print(f"Database: {engine.url}\n")
+
+    migrate_database()
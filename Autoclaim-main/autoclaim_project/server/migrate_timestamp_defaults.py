@@ -0,0 +1,90 @@
+"""
+Database migration script for the server-side timestamp defaults.
+created_at / analyzed_at also carry a database default (UTC now), so rows
+inserted outside the app get a timestamp too. The app still sets them itself,
+so older tables without the default keep working; this script is optional.
+
+PostgreSQL: ALTER COLUMN ... SET DEFAULT timezone('utc', now()) (also fixes
+columns that got a plain now() default, which is session-local time).
+SQLite: cannot change a column default in place, so each affected table
+is rebuilt from the current model and its rows copied over.
+"""
+
+from sqlalchemy import inspect
+
+from app.db.database import engine
+from app.db import models
+
+TIMESTAMP_COLUMNS = {
+    models.User: "created_at",
+    models.PolicyPlan: "created_at",
+    models.Policy: "created_at",
+    models.Claim: "created_at",
+    models.ForensicAnalysis: "analyzed_at",
+}
+
+
+def _missing_default(inspector, table_name: str, column: str) -> bool:
+    for col in inspector.get_columns(table_name):
+        if col["name"] == column:
+            return col.get("default") is None
+    return False
+
+
+def _rebuild_sqlite_table(conn, inspector, table):
+    """Recreate a SQLite table from the model and copy its rows across."""
+    name = table.name
+    old_name = f"{name}__old"
+    existing = {col["name"] for col in inspector.get_columns(name)}
+    shared = ", ".join(c for c in table.columns.keys() if c in existing)
+    
+    # Named indexes move with the renamed table and would clash with the new ones
+    for index in inspector.get_indexes(name):
+        conn.exec_driver_sql(f'DROP INDEX IF EXISTS "{index["name"]}"')
+    conn.exec_driver_sql(f'ALTER TABLE "{name}" RENAME TO "{old_name}"')
+    table.create(bind=conn)
+    conn.exec_driver_sql(f'INSERT INTO "{name}" ({shared}) SELECT {shared} FROM "{old_name}"')
+    conn.exec_driver_sql(f'DROP TABLE "{old_name}"')
+
+
+def migrate_database():
+    """Add the UTC default to the timestamp columns that lack it."""
+    inspector = inspect(engine)
+    is_sqlite = engine.dialect.name == "sqlite"
+    # SET DEFAULT is idempotent, so PostgreSQL columns are always (re)set
+    pending = [
+        (model, column) for model, column in TIMESTAMP_COLUMNS.items()
+        if inspector.has_table(model.__tablename__)
+        and (not is_sqlite or _missing_default(inspector, model.__tablename__, column))
+    ]
+    
+    if not pending:
+        print("✓ All timestamp columns already have a server default")
+        return
+    
+    with engine.begin() as conn:
+        if is_sqlite:
+            # Keep foreign keys in other tables pointing at the original names
+            conn.exec_driver_sql("PRAGMA legacy_alter_table=ON")
+        
+        for model, column in pending:
+            table_name = model.__tablename__
+            if is_sqlite:
+                _rebuild_sqlite_table(conn, inspector, model.__table__)
+            else:
+                conn.exec_driver_sql(
+                    f'ALTER TABLE "{table_name}" ALTER COLUMN "{column}" '
+                    f"SET DEFAULT timezone('utc', now())"
+                )
+            print(f"✓ {table_name}.{column}")
+    
+    print("\n✅ Database migration completed successfully!")
+
+
+if __name__ == "__main__":
+    print("=" * 50)
+    print("Database Migration: Server-side Timestamp Defaults")
+    print("=" * 50)
+    print(f"Database: {engine.url}\n")
+    
+    migrate_database()
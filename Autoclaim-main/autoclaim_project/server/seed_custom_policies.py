@@ -154,7 +154,7 @@ def display_custom_policies(db):
         print(f"  Plan: {policy.plan.name}")
         print(f"  Max Claim: ₹{policy.plan.coverage_amount:,}")
         print(f"  Status: {policy.status}")
-        print(f"  Valid: {policy.start_date.strftime('%Y-%m-%d')} to {policy.end_date.strftime('%Y-%m-%d')}")
+        print(f"  Valid: {policy.start_date.date().isoformat()} to {policy.end_date.date().isoformat()}")
         print(f"  {'-' * 76}\n")
 
 
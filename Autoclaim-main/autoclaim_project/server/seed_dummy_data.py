@@ -310,7 +310,7 @@ def display_summary(db):
         print(f"   Plan: {policy.plan.name}")
         print(f"   Max Claim: ₹{policy.plan.coverage_amount:,}")
         print(f"   Status: {policy.status}")
-        print(f"   Valid: {policy.start_date.strftime('%Y-%m-%d')} to {policy.end_date.strftime('%Y-%m-%d')}")
+        print(f"   Valid: {policy.start_date.date().isoformat()} to {policy.end_date.date().isoformat()}")
         print()
     
     # Users
@@ -331,7 +331,7 @@ def display_summary(db):
         print(f"   Claim ID: {claim.id}")
         print(f"   User: {claim.user.email}")
         print(f"   Status: {claim.status}")
-        print(f"   Accident Date: {claim.created_at.strftime('%Y-%m-%d')}")
+        print(f"   Accident Date: {claim.created_at.date().isoformat()}")
         print(f"   Description: {claim.description[:80]}...")
         print()
     
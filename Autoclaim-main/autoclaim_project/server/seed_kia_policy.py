@@ -111,8 +111,8 @@ def seed_kia_policy():
         print(f"   Premium: ₹{plan.premium_monthly:,}/month")
         print(f"   Type: {plan.name}")
         print(f"   Status: {policy.status.upper()}")
-        print(f"   Valid From: {policy.start_date.strftime('%Y-%m-%d')}")
-        print(f"   Valid Until: {policy.end_date.strftime('%Y-%m-%d')}")
+        print(f"   Valid From: {policy.start_date.date().isoformat()}")
+        print(f"   Valid Until: {policy.end_date.date().isoformat()}")
         
         print(f"\n👤 User Details:")
         print(f"   Email: {user.email}")
@@ -155,8 +155,8 @@ def display_policy_data(db):
         print(f"  Status: {policy.status.upper()}")
         print(f"  Coverage: ${policy.plan.coverage_amount:,}")
         print(f"  Monthly Premium: ${policy.plan.premium_monthly}")
-        print(f"  Start Date: {policy.start_date.strftime('%Y-%m-%d')}")
-        print(f"  End Date: {policy.end_date.strftime('%Y-%m-%d')}")
+        print(f"  Start Date: {policy.start_date.date().isoformat()}")
+        print(f"  End Date: {policy.end_date.date().isoformat()}")
         print(f"  Claims: {len(policy.claims)}")
         print(f"  {'-' * 76}")
 
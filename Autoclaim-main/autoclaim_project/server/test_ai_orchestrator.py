@@ -26,8 +26,12 @@ if claim:
     )
     
     print("\n=== AI ORCHESTRATOR RESULT ===\n")
-    import json
-    print(json.dumps(result, indent=2, default=str))
+    import orjson
+    print(orjson.dumps(
+        result,
+        option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+        default=str
+    ).decode())
     
     # Check what keys are at the top level
     print("\n=== TOP LEVEL KEYS ===")
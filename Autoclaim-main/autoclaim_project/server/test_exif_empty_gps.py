@@ -0,0 +1,51 @@
+"""
+Test EXIF extraction for a JPEG whose GPSInfo pointer leads to an empty GPS IFD.
+The other tags (date, make, model) must still be read.
+"""
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from datetime import datetime
+from PIL import Image
+
+from app.services.exif_service import extract_metadata
+
+
+def test_empty_gps_ifd():
+    exif = Image.Exif()
+    exif[0x010F] = "Canon"                                     # Make
+    exif[0x0110] = "EOS 80D"                                   # Model
+    exif.get_ifd(0x8769)[0x9003] = "2024:01:02 03:04:05"       # DateTimeOriginal
+    exif[0x8825] = {}                                          # empty GPS IFD
+
+    fd, path = tempfile.mkstemp(suffix=".jpg")
+    os.close(fd)
+    try:
+        Image.new("RGB", (8, 8)).save(path, exif=exif)
+        result = extract_metadata(path)
+    finally:
+        os.remove(path)
+
+    assert result["timestamp"] == datetime(2024, 1, 2, 3, 4, 5), result
+    assert result["source"] == "exif", result
+    assert result["camera_make"] == "Canon", result
+    assert result["camera_model"] == "EOS 80D", result
+    assert result["gps_lat"] is None and result["gps_lon"] is None, result
+    return result
+
+
+if __name__ == "__main__":
+    print("=" * 50)
+    print("EXIF EMPTY GPS IFD TEST")
+    print("=" * 50)
+    try:
+        result = test_empty_gps_ifd()
+        print(f"✓ Timestamp: {result['timestamp']}")
+        print(f"✓ Camera: {result['camera_type']}")
+        print("\n✅ Empty GPS IFD handled")
+    except AssertionError as e:
+        print(f"\n❌ Failed: {e}")
+        sys.exit(1)
@@ -8,7 +8,7 @@ import sys
 from app.services.ai_orchestrator import analyze_claim
 from app.db.database import SessionLocal
 from app.db.models import Policy
-import json
+import orjson
 
 # Base directory
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -145,7 +145,11 @@ print("\n" + "=" * 80)
 
 # Save full result to JSON for inspection
 output_file = os.path.join(BASE_DIR, "test_extraction_result.json")
-with open(output_file, 'w') as f:
-    json.dump(result, f, indent=2, default=str)
+with open(output_file, 'wb') as f:
+    f.write(orjson.dumps(
+        result,
+        option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+        default=str
+    ))
 print(f"💾 Full result saved to: {output_file}")
 print("=" * 80)
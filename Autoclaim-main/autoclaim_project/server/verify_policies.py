@@ -21,9 +21,9 @@ try:
         for idx, policy in enumerate(policies, 1):
             # Determine policy number based on start date
             policy_number = f"POL-2024-{str(idx).zfill(5)}"
-            if policy.start_date.strftime('%Y-%m-%d') == '2026-02-10':
+            if policy.start_date.date().isoformat() == '2026-02-10':
                 policy_number = "POL-2024-00001"
-            elif policy.start_date.strftime('%Y-%m-%d') == '2026-02-12':
+            elif policy.start_date.date().isoformat() == '2026-02-12':
                 policy_number = "POL-2024-00007"
             
             print(f"  Policy Number: {policy_number}")
@@ -32,7 +32,7 @@ try:
             print(f"  Plan: {policy.plan.name}")
             print(f"  Max Claim: ₹{policy.plan.coverage_amount:,}")
             print(f"  Status: {policy.status}")
-            print(f"  Valid: {policy.start_date.strftime('%Y-%m-%d')} to {policy.end_date.strftime('%Y-%m-%d')}")
+            print(f"  Valid: {policy.start_date.date().isoformat()} to {policy.end_date.date().isoformat()}")
             print("  " + "-" * 76 + "\n")
     
     print("=" * 80)